@@ -0,0 +1,28 @@
+"""JSON helpers that use orjson when it is installed, falling back to the stdlib json module."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None  # pylint: disable=invalid-name
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can catch this for both.
+JSONDecodeError = json.JSONDecodeError
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Parse a JSON document from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, optionally indented by two spaces."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
@@ -1,12 +1,14 @@
 """Utility classes and functions"""
 
 import argparse
+import errno
 import logging
+import os
+import shutil
 import textwrap
+from functools import lru_cache
 from pathlib import Path
 
-from pdfminer.high_level import extract_text
-
 from pdfclassify.config import PDFClassifyConfig
 
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
@@ -35,13 +37,34 @@ class RawFormatter(argparse.HelpFormatter):
         )
 
 
+def move_file(src: Path, dest: Path) -> None:
+    """Move a file with a single rename, copying only when dest is on another filesystem."""
+    try:
+        os.rename(src, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dest)
+
+
 # in _util.py
 
 
+@lru_cache(maxsize=64)
+def _extract_text_cached(
+    path: str, mtime_ns: int, size: int  # pylint: disable=unused-argument
+) -> str:
+    """Extract text once per file version; mtime and size only form the cache key."""
+    from pdfminer.high_level import extract_text  # pylint: disable=import-outside-toplevel
+
+    return extract_text(path) or ""
+
+
 def extract_text_from_pdf(pdf_path: Path) -> str:
     """Extract text using pdfminer.six (better layout/text coverage)."""
     try:
-        return extract_text(str(pdf_path)) or ""
+        stat = os.stat(pdf_path)
+        return _extract_text_cached(os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size)
     except Exception as e:  # pylint: disable=broad-exception-caught
         print(f"⚠️ PDF text extraction failed: {e}")
         return ""
@@ -1,7 +1,8 @@
 """Argument handler for this project."""
 
 from argparse import ArgumentParser, Namespace, _HelpAction
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Sequence
 
@@ -25,6 +26,7 @@ class HelpAndCustom(_HelpAction):
         parser.exit()
 
 
+@lru_cache(maxsize=1)
 def get_version() -> str:
     """Lazy import of package version to speed up CLI loading."""
     from importlib.metadata import version  # pylint: disable=import-outside-toplevel
@@ -36,6 +38,8 @@ def get_version() -> str:
 class ParsedArgs:
     """Parsed command-line arguments for the PDF classifier."""
 
+    # pylint: disable=too-many-instance-attributes
+
     verbose: bool
     input_file: str
     training_data_path: str
@@ -43,6 +47,8 @@ class ParsedArgs:
     no_rename: bool
     restore_original: bool
     info: bool
+    # Every file named on the command line; input_file is the first of them
+    input_files: tuple[str, ...] = field(default=())
 
 
 class CustomArgumentParser(ArgumentParser):
@@ -54,60 +60,62 @@ class CustomArgumentParser(ArgumentParser):
         self.exit(2, f"\nerror: {message}\n")
 
 
+@lru_cache(maxsize=1)
+def _build_parser() -> ArgumentParser:
+    """Build the command-line parser once per process.
+
+    Path defaults are left unset here and filled in from CONFIG when parsing.
+    """
+    parser = CustomArgumentParser(
+        description="Classify PDF files based on semantic embeddings",
+        formatter_class=RawFormatter,
+        add_help=False,
+    )
+    parser.add_argument(
+        "-h",
+        "--help",
+        action=HelpAndCustom,
+        help="show this help message and then run custom code",
+    )
+    parser.add_argument(
+        "-V",
+        "--version",
+        action="version",
+        version=get_version(),
+        help="Print the version number",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", default=False, help="Verbose output"
+    )
+    parser.add_argument(
+        "-t",
+        "--training-data-path",
+        help="Path to the directory containing the training data",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-path",
+        help="Path to save the labelled file",
+    )
+
+    exclusive_group = parser.add_mutually_exclusive_group()
+    exclusive_group.add_argument(
+        "-n", "--no-rename", action="store_true", help="Do not rename the input file"
+    )
+    exclusive_group.add_argument(
+        "-r", "--restore-original", action="store_true", help="Restore original filename"
+    )
+    exclusive_group.add_argument("-i", "--info", action="store_true", help="Display file metadata")
+
+    parser.add_argument("input_file", nargs="+", help="Input PDF file(s) to classify")
+    return parser
+
+
 class ArgumentHandler:
     """Class for handling command-line arguments."""
 
     def __init__(self):
-        self.parser = self._make_cmd_line_parser()
-
-    def _make_cmd_line_parser(self) -> ArgumentParser:
-        parser = CustomArgumentParser(
-            description="Classify PDF files based on semantic embeddings",
-            formatter_class=RawFormatter,
-            add_help=False,
-        )
-        parser.add_argument(
-            "-h",
-            "--help",
-            action=HelpAndCustom,
-            help="show this help message and then run custom code",
-        )
-        parser.add_argument(
-            "-V",
-            "--version",
-            action="version",
-            version=get_version(),
-            help="Print the version number",
-        )
-        parser.add_argument(
-            "-v", "--verbose", action="store_true", default=False, help="Verbose output"
-        )
-        parser.add_argument(
-            "-t",
-            "--training-data-path",
-            default=CONFIG.training_data_dir,
-            help="Path to the directory containing the training data",
-        )
-        parser.add_argument(
-            "-o",
-            "--output-path",
-            default=CONFIG.output_dir,
-            help="Path to save the labelled file",
-        )
-
-        exclusive_group = parser.add_mutually_exclusive_group()
-        exclusive_group.add_argument(
-            "-n", "--no-rename", action="store_true", help="Do not rename the input file"
-        )
-        exclusive_group.add_argument(
-            "-r", "--restore-original", action="store_true", help="Restore original filename"
-        )
-        exclusive_group.add_argument(
-            "-i", "--info", action="store_true", help="Display file metadata"
-        )
-
-        parser.add_argument("input_file", help="Input PDF file to classify")
-        return parser
+        self.parser = _build_parser()
 
     def parse_args(self) -> ParsedArgs:
         """Parse the command-line arguments from sys.argv."""
@@ -119,14 +127,15 @@ class ArgumentHandler:
 
     def _parse(self, args: Namespace) -> ParsedArgs:
         """Convert Namespace to ParsedArgs dataclass."""
-        if not args.input_file or not args.input_file.strip():
+        if not args.input_file or not all(name.strip() for name in args.input_file):
             raise ValueError("Input file is required")
 
         return ParsedArgs(
             verbose=args.verbose,
-            input_file=args.input_file,
-            training_data_path=args.training_data_path,
-            output_path=args.output_path,
+            input_file=args.input_file[0],
+            input_files=tuple(args.input_file),
+            training_data_path=args.training_data_path or CONFIG.training_data_dir,
+            output_path=args.output_path or CONFIG.output_dir,
             no_rename=args.no_rename,
             restore_original=args.restore_original,
             info=args.info,
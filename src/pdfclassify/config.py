@@ -70,6 +70,12 @@ class PDFClassifyConfig:  # pylint: disable=too-many-instance-attributes
         self.confidence_threshold: float = float(
             config.get("settings", {}).get("confidence_threshold", 0.75)
         )
+        self.embedding_backend: str = (
+            str(config.get("settings", {}).get("embedding_backend", "torch")).strip().lower()
+        )
+        self.embedding_model_file: Optional[str] = (
+            config.get("settings", {}).get("embedding_model_file") or None
+        )
         self.label_config_path = resolve_and_expand_path(
             str(
                 config.get("paths", {}).get(
@@ -108,6 +114,7 @@ class PDFClassifyConfig:  # pylint: disable=too-many-instance-attributes
             "Training data directory": str(self.training_data_dir),
             "Cache directory": str(self.cache_dir),
             "Confidence threshold": str(self.confidence_threshold),
+            "Embedding backend": self.embedding_backend,
         }
         # Determine column widths
         max_key_len = max(len(key) for key in entries)
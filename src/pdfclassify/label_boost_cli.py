@@ -3,7 +3,6 @@
 DEVONthink and validation support."""
 
 import ast
-import json
 import subprocess
 import sys
 from typing import List
@@ -11,6 +10,7 @@ from typing import List
 import questionary
 from prompt_toolkit.styles import Style
 
+from pdfclassify._json_io import JSONDecodeError, json_dumps, json_loads
 from pdfclassify._util import CONFIG  # pylint: disable=no-name-in-module
 from pdfclassify.label_boost_manager import LabelBoostManager
 from pdfclassify.label_config import LabelConfig
@@ -101,13 +101,12 @@ class LabelBoostCLI:
         # ✅ Try cached file first
         if not force_refresh and CACHE_PATH.exists():
             try:
-                with open(CACHE_PATH, "r", encoding="utf-8") as f:
-                    cached = json.load(f)
-                    if isinstance(cached, list):
-                        filtered = _filter_leaf_groups(cached)
-                        LabelBoostCLI._devonthink_groups_cache = filtered
-                        return filtered
-            except (OSError, json.JSONDecodeError):
+                cached = json_loads(CACHE_PATH.read_bytes())
+                if isinstance(cached, list):
+                    filtered = _filter_leaf_groups(cached)
+                    LabelBoostCLI._devonthink_groups_cache = filtered
+                    return filtered
+            except (OSError, JSONDecodeError):
                 print("⚠️ Failed to load group cache. Will re-query DEVONthink.")
 
         # ✅ Query DEVONthink via AppleScript
@@ -144,8 +143,7 @@ class LabelBoostCLI:
             # ✅ Cache the filtered list
             LabelBoostCLI._devonthink_groups_cache = filtered
             CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-            with open(CACHE_PATH, "w", encoding="utf-8") as f:
-                json.dump(filtered, f, indent=2, ensure_ascii=False)
+            CACHE_PATH.write_bytes(json_dumps(filtered, indent=True))
             return filtered
         except subprocess.CalledProcessError as err:
             print("⚠️ Could not retrieve groups from DEVONthink:", err)
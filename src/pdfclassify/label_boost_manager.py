@@ -6,13 +6,17 @@ and provides access to boost values and related metadata for each label.
 It also supports identifying training labels that are missing configuration entries.
 """
 
-import json
 import logging
-from typing import Dict, Optional, Set
+import os
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Set
 
+from pdfclassify._json_io import JSONDecodeError, json_dumps, json_loads
 from pdfclassify._util import CONFIG  # pylint: disable=no-name-in-module
 from pdfclassify.label_config import LabelConfig
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class LabelBoostManager:
     """Handles boost logic and metadata for labels."""
@@ -27,14 +31,13 @@ class LabelBoostManager:
         """Load and validate the boost config from the configured path."""
         if CONFIG.label_config_path.exists():
             try:
-                with open(CONFIG.label_config_path, "r", encoding="utf-8") as file:
-                    raw = json.load(file)
-                    return {
-                        label: LabelConfig.from_dict(value)
-                        for label, value in raw.items()
-                        if isinstance(value, dict)
-                    }
-            except (json.JSONDecodeError, OSError) as exc:
+                raw = json_loads(CONFIG.label_config_path.read_bytes())
+                return {
+                    label: LabelConfig.from_dict(value)
+                    for label, value in raw.items()
+                    if isinstance(value, dict)
+                }
+            except (JSONDecodeError, OSError) as exc:
                 self.logger.warning("Failed to load boost config: %s", exc)
         return {}
 
@@ -50,22 +53,42 @@ class LabelBoostManager:
             self.logger.info("Boosted %s by %.2f due to matching phrase", label, score)
         return score
 
+    def boost_vector(self, labels: Sequence[str], text: str) -> "np.ndarray":
+        """Return the boost for each entry of ``labels`` as an array aligned with it.
+
+        Labels repeat once per training document, so each distinct label is only
+        matched against the text once.
+        """
+        # numpy stays out of the pdfconfig start-up path; only the classifier needs it
+        import numpy as np  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        scores = {label: self.boost_score(label, text) for label in dict.fromkeys(labels)}
+        return np.fromiter((scores[label] for label in labels), dtype=np.float64, count=len(labels))
+
+    @staticmethod
+    def _training_labels() -> Optional[Set[str]]:
+        """Return the label folder names under the training directory, or None if it is missing."""
+        try:
+            # DirEntry.is_dir() uses the directory listing's file type, so no stat per entry
+            with os.scandir(CONFIG.training_data_dir) as entries:
+                return {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            return None
+
     def missing_labels(self) -> Set[str]:
         """Return a set of training directory labels missing from the config."""
-        if not CONFIG.training_data_dir.exists():
+        training_labels = self._training_labels()
+        if training_labels is None:
             return set()
-        training_labels = {
-            path.name for path in CONFIG.training_data_dir.iterdir() if path.is_dir()
-        }
         return training_labels - self.config.keys()
 
     def sync_with_training_labels(self, interactive: bool = False) -> None:
         """Ensure all training labels are represented in the config,
         remove entries for labels that no longer exist, and save changes."""
-        if not CONFIG.training_data_dir.exists():
+        training_labels = self._training_labels()
+        if training_labels is None:
             return
 
-        training_labels = {p.name for p in CONFIG.training_data_dir.iterdir() if p.is_dir()}
         modified = False
 
         # Remove obsolete labels
@@ -95,10 +118,6 @@ class LabelBoostManager:
 
     def save(self) -> None:
         """Save current config back to disk."""
-        with open(CONFIG.label_config_path, "w", encoding="utf-8") as file:
-            json.dump(
-                {label: cfg.to_dict() for label, cfg in self.config.items()},
-                file,
-                indent=2,
-                ensure_ascii=False,
-            )
+        CONFIG.label_config_path.write_bytes(
+            json_dumps({label: cfg.to_dict() for label, cfg in self.config.items()}, indent=True)
+        )
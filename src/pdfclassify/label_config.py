@@ -4,10 +4,12 @@ This class handles validation, defaulting, and serialization of label-specific
 boost and metadata settings.
 """
 
+import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Callable, Dict, List, Optional, Union
 
-_ALLOWED_MINIMUM_PARTS = {"day", "month", "year"}
+_ALLOWED_MINIMUM_PARTS = frozenset(("day", "month", "year"))
 _DEFAULT_MINIMUM_PARTS = ["day", "month", "year"]
 
 
@@ -29,6 +31,12 @@ def is_valid_parts(val: Any) -> bool:
     )
 
 
+@lru_cache(maxsize=256)
+def _phrase_pattern(phrases: tuple[str, ...]) -> re.Pattern:
+    """Compile boost phrases into one case-insensitive alternation."""
+    return re.compile("|".join(map(re.escape, phrases)), re.IGNORECASE)
+
+
 SCHEMA: Dict[str, Dict[str, Union[Any, Callable[[], Any], Callable[[Any], bool]]]] = {
     "boost_phrases": {
         "default": list,
@@ -118,11 +126,9 @@ class LabelConfig:
                     elif value > rules.get("clamp_max", value):
                         value = rules["clamp_max"]
 
-            if field_name == "minimum_parts":
-                if isinstance(value, list):
-                    value = [p for p in value if p in _ALLOWED_MINIMUM_PARTS]
-                    if not value:
-                        value = _DEFAULT_MINIMUM_PARTS.copy()
+            # is_valid_parts already rejected unknown parts; only an empty list is left
+            if field_name == "minimum_parts" and not value:
+                value = _DEFAULT_MINIMUM_PARTS.copy()
 
             data[field_name] = value
 
@@ -142,7 +148,10 @@ class LabelConfig:
 
     def matches_phrase(self, text: str) -> bool:
         """Return True if any boost phrase appears in the given text (case-insensitive)."""
-        return any(p.lower() in text.lower() for p in self.boost_phrases)
+        if not self.boost_phrases:
+            return False
+        # Keyed on the phrases themselves, so edits to boost_phrases are picked up
+        return _phrase_pattern(tuple(self.boost_phrases)).search(text) is not None
 
     def get_boost_if_matched(self, text: str) -> float:
         """Return the boost value if a phrase matches the given text, else 0.0."""
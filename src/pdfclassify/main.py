@@ -29,15 +29,20 @@ class Pdfclassify:
         """Main entry point"""
 
         args = self.parser.parse_args()
-        pdf = PdfProcess(args.input_file)
-
-        if args.info:
-            pdf.display_info()
+        if args.info or args.restore_original:
+            for input_file in args.input_files:
+                pdf = PdfProcess(input_file)
+                if args.info:
+                    pdf.display_info()
+                else:
+                    pdf.restore_original_state()
             return
-        if args.restore_original:
-            pdf.restore_original_state()
+        if len(args.input_files) > 1:
+            errors = PdfProcess.process_many(args.input_files, args)
+            if errors:
+                raise MyException("\n".join(errors), 1)
             return
-        pdf.predict(args)
+        PdfProcess(args.input_file).predict(args, PdfProcess.train_classifier(args))
 
 
 def main():
@@ -16,48 +16,116 @@ Enhancements vs. the original:
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import accumulate
 from pathlib import Path
-from typing import Optional
-
-from dateparser import parse
+from typing import TYPE_CHECKING, Iterator, Optional
 
+from pdfclassify._json_io import JSONDecodeError, json_loads
 from pdfclassify._util import extract_text_from_pdf
 from pdfclassify.argument_handler import get_version
 
+if TYPE_CHECKING:
+    from dateparser.date import DateDataParser
+
 # Precompiled patterns/constants
 # Lowercase month name pattern for quick "day present?" checks.
 _MONTH_NAME_SHORT = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*"
 
 # NOTE: Order matters. More specific patterns should come before generic ones.
+# Possessive quantifiers (Python 3.11+) are used wherever the following token can never
+# match the same characters, so failed matches give up immediately instead of backtracking.
 DATE_REGEXES = [
     # Month-name first (e.g., "July 25, 2025", "July 25, 2025 08:00:04 CEST")
     (
         r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)"
-        r"\s+\d{1,2},?\s+\d{4}(?:\s+\d{2}:\d{2}(?::\d{2})?(?:\s+[A-Z]{2,5})?)?\b"
+        r"\s++\d{1,2}+,?\s++\d{4}(?:\s++\d{2}:\d{2}(?::\d{2})?(?:\s++[A-Z]{2,5})?)?\b"
     ),
     # Month abbreviation first (e.g., "Jul 25, 2025", "Sept 7, 2025 08:00 CEST")
     (
         r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)\.?"
-        r"\s+\d{1,2},?\s+\d{4}(?:\s+\d{2}:\d{2}(?::\d{2})?(?:\s+[A-Z]{2,5})?)?\b"
+        r"\s++\d{1,2}+,?\s++\d{4}(?:\s++\d{2}:\d{2}(?::\d{2})?(?:\s++[A-Z]{2,5})?)?\b"
     ),
     # Month/year only (numeric, keep early so it’s found when allowed)
     r"(?:0?[1-9]|1[0-2])[/-]20\d{2}",
     # Common numeric variants
-    r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b",  # e.g., 25/07/2025 or 07-25-25
-    r"\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b",  # e.g., 2025-07-25
+    r"\b\d{1,2}+[/-]\d{1,2}+[/-]\d{2,4}+\b",  # e.g., 25/07/2025 or 07-25-25
+    r"\b\d{4}[/-]\d{1,2}+[/-]\d{1,2}+\b",  # e.g., 2025-07-25
     # Day Monthname Year variants across languages
-    r"\b\d{1,2}\s+[a-zA-Zéêäöüßçñ]+\s+\d{2,4}\b",  # e.g., 25 July 2025
-    r"\b\d{1,2}\.\s*[a-zA-Zéêäöüßçñ]+\s+\d{4}\b",  # e.g., 25. Juli 2025
-    r"\b\d{1,2}\s+de\s+[a-zA-Zéêäöüßçñ]+\s+de\s+\d{4}\b",  # e.g., 25 de julio de 2025
-    r"\b\d{1,2}\s+[a-zA-Zéêäöüßçñ]{3,}\.?\s+\d{4}\b",  # e.g., 25 sept. 2025
+    r"\b\d{1,2}+\s++[a-zA-Zéêäöüßçñ]++\s++\d{2,4}+\b",  # e.g., 25 July 2025
+    r"\b\d{1,2}+\.\s*+[a-zA-Zéêäöüßçñ]++\s++\d{4}\b",  # e.g., 25. Juli 2025
+    r"\b\d{1,2}+\s++de\s++[a-zA-Zéêäöüßçñ]++\s++de\s++\d{4}\b",  # e.g., 25 de julio de 2025
+    r"\b\d{1,2}+\s++[a-zA-Zéêäöüßçñ]{3,}+\.?\s++\d{4}\b",  # e.g., 25 sept. 2025
 ]
 
+# dateparser settings shared by every lookup.
+_PARSER_SETTINGS = {"PREFER_DAY_OF_MONTH": "first", "DATE_ORDER": "DMY"}
+
+# Helpers for meets_minimum_parts / parse_month_year, compiled once.
+_MONTH_YEAR_FULL = re.compile(r"(0?[1-9]|1[0-2])[/-](20\d{2})")
+_NUMERIC_DAY = re.compile(r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b")
+_DAY_BEFORE_WORD = re.compile(r"\b\d{1,2}\s+[a-z]")
+_DAY_AFTER_MONTH = re.compile(rf"\b{_MONTH_NAME_SHORT}\.?\s+\d{{1,2}}\b")
+
+# Tokens recognized by format_with_template.
+_TEMPLATE_TOKEN = re.compile(r"YYYY|MM|DD")
+
+# Page count above which --list parses pages in a process pool.
+_PARALLEL_PAGE_THRESHOLD = 8
+
+# Indexes of the numeric patterns in DATE_REGEXES, which are parsed without dateparser.
+_MONTH_YEAR_ID = 2
+_NUMERIC_DMY_ID = 3
+_NUMERIC_YMD_ID = 4
+_NUMERIC_SEPARATOR = re.compile(r"[/-]")
+# Patterns from this index on are "day monthname year" forms that match any word.
+_FIRST_WORD_ID = 5
+
+# First three letters of month names (en, fr, de, es) for the word-form pre-check.
+_MONTH_STEMS = frozenset(
+    "jan jän feb fév fev mar mär apr avr abr may mai jun jui jul aug aoû aou ago sep set "
+    "oct okt nov dec déc dez dic ene".split()
+)
+_WORD = re.compile(r"[^\W\d_]+")
+
+# All DATE_REGEXES fused into one alternation so the text is scanned once. Each pattern
+# gets a named group "p<index>", so a match reports which pattern produced it; at any
+# given position the alternatives are tried in DATE_REGEXES order.
+_DATE_SCANNER = re.compile(
+    "|".join(f"(?P<p{idx}>{pattern})" for idx, pattern in enumerate(DATE_REGEXES)),
+    flags=re.IGNORECASE,
+)
+
+# The same patterns as a zero-width lookahead: reports the candidate at every start
+# position, including candidates that overlap an earlier one.
+_DATE_CANDIDATES = re.compile(f"(?=(?:{_DATE_SCANNER.pattern}))", flags=re.IGNORECASE)
+
+
+def _load_sidecar(pdf_file: Path) -> dict:
+    """
+    Read and parse the companion sidecar JSON (same name + ".meta.json") once.
+
+    Args:
+        pdf_file: Path to the PDF file.
+
+    Returns:
+        The sidecar contents, or an empty dict if it is missing or invalid.
+    """
+    meta_path = pdf_file.with_suffix(pdf_file.suffix + ".meta.json")
+    try:
+        data = json_loads(meta_path.read_bytes())
+    except (OSError, JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
 
-def load_minimum_parts(pdf_file: Path) -> list[str]:
+def load_minimum_parts(pdf_file: Path, sidecar: Optional[dict] = None) -> list[str]:
     """
     Load the minimum required date parts for a given PDF.
 
@@ -66,22 +134,17 @@ def load_minimum_parts(pdf_file: Path) -> list[str]:
 
     Args:
         pdf_file: Path to the PDF file.
+        sidecar: Already-parsed sidecar contents; read from disk when omitted.
 
     Returns:
         A list of required parts. Defaults to ["day", "month", "year"].
     """
-    meta_path = pdf_file.with_suffix(pdf_file.suffix + ".meta.json")
-    if meta_path.exists():
-        try:
-            with meta_path.open("r", encoding="utf-8") as handle:
-                return json.load(handle).get("minimum_parts", ["day", "month", "year"])
-        except json.JSONDecodeError:
-            # Fall back to default if JSON is invalid.
-            pass
-    return ["day", "month", "year"]
+    if sidecar is None:
+        sidecar = _load_sidecar(pdf_file)
+    return sidecar.get("minimum_parts", ["day", "month", "year"])
 
 
-def get_preferred_contexts(pdf_file: Path) -> list[str]:
+def get_preferred_contexts(pdf_file: Path, sidecar: Optional[dict] = None) -> list[str]:
     """
     Load preferred context keywords to bias where dates are extracted.
 
@@ -91,20 +154,15 @@ def get_preferred_contexts(pdf_file: Path) -> list[str]:
 
     Args:
         pdf_file: Path to the PDF file.
+        sidecar: Already-parsed sidecar contents; read from disk when omitted.
 
     Returns:
         A list of context strings (case-insensitive comparisons are applied).
     """
-    meta_path = pdf_file.with_suffix(pdf_file.suffix + ".meta.json")
-    if meta_path.exists():
-        try:
-            with meta_path.open("r", encoding="utf-8") as handle:
-                data = json.load(handle)
-                contexts = data.get("/preferred_context", [])
-                return contexts if isinstance(contexts, list) else []
-        except (json.JSONDecodeError, TypeError):
-            return []
-    return []
+    if sidecar is None:
+        sidecar = _load_sidecar(pdf_file)
+    contexts = sidecar.get("/preferred_context", [])
+    return contexts if isinstance(contexts, list) else []
 
 
 def meets_minimum_parts(parsed: datetime, raw: str, min_parts: list[str]) -> bool:
@@ -124,15 +182,15 @@ def meets_minimum_parts(parsed: datetime, raw: str, min_parts: list[str]) -> boo
         True if the date meets the requirement, False otherwise.
     """
     raw_norm = raw.strip().lower()
-    is_month_year = bool(re.fullmatch(r"(0?[1-9]|1[0-2])[/-]20\d{2}", raw_norm))
+    is_month_year = bool(_MONTH_YEAR_FULL.fullmatch(raw_norm))
 
     # Detect presence of a day in multiple formats:
     # - numeric day first: "25/07/2025" or "25 July 2025"
     # - month-name first: "july 25, 2025" (abbrev/long forms)
     has_day = not is_month_year and (
-        re.search(r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b", raw_norm)  # 25/07/2025, 07-25-2025
-        or re.search(r"\b\d{1,2}\s+[a-z]", raw_norm)  # 25 July 2025
-        or re.search(rf"\b{_MONTH_NAME_SHORT}\.?\s+\d{{1,2}}\b", raw_norm)  # July 25, 2025
+        _NUMERIC_DAY.search(raw_norm)  # 25/07/2025, 07-25-2025
+        or _DAY_BEFORE_WORD.search(raw_norm)  # 25 July 2025
+        or _DAY_AFTER_MONTH.search(raw_norm)  # July 25, 2025
     )
 
     has_month = parsed.month is not None
@@ -160,15 +218,150 @@ def parse_month_year(raw: str) -> Optional[datetime]:
     Returns:
         A datetime set to the first day of the month if matched, else None.
     """
-    match = re.fullmatch(r"(0?[1-9]|1[0-2])[/-](20\d{2})", raw.strip())
+    match = _MONTH_YEAR_FULL.fullmatch(raw.strip())
     if match:
         return datetime(int(match.group(2)), int(match.group(1)), 1)
     return None
 
 
-def find_all_dates(
+def looks_like_date(raw: str) -> bool:
+    """
+    Cheap pre-check for word-form matches before handing them to dateparser.
+
+    Args:
+        raw: The raw matched string.
+
+    Returns:
+        True if any word in `raw` starts like a month name in a supported language.
+    """
+    return any(word[:3].lower() in _MONTH_STEMS for word in _WORD.findall(raw))
+
+
+def parse_numeric_date(raw: str, pattern_id: int) -> Optional[datetime]:
+    """
+    Parse an all-numeric day-first or ISO (year-first) date without dateparser.
+
+    Args:
+        raw: The raw matched string.
+        pattern_id: Index of the DATE_REGEXES pattern that matched `raw`.
+
+    Returns:
+        The parsed datetime, or None if the match is not numeric, has a two-digit
+        year, or is not a valid calendar date (the caller then falls back to dateparser).
+    """
+    if pattern_id not in (_NUMERIC_DMY_ID, _NUMERIC_YMD_ID):
+        return None
+    parts = _NUMERIC_SEPARATOR.split(raw.strip())
+    if pattern_id == _NUMERIC_DMY_ID:
+        day, month, year = parts
+    else:
+        year, month, day = parts
+    if len(year) != 4:
+        return None
+    try:
+        return datetime(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _date_parser(languages: tuple[str, ...]) -> DateDataParser:
+    """Return a shared DateDataParser for the given languages."""
+    # dateparser takes a few hundred ms to import, so only load it when a word date needs it
+    from dateparser.date import DateDataParser  # pylint: disable=import-outside-toplevel
+
+    return DateDataParser(languages=list(languages), settings=_PARSER_SETTINGS)
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached(raw: str, languages: tuple[str, ...]) -> Optional[datetime]:
+    """Parse a raw date string with dateparser, memoizing repeated strings."""
+    return _date_parser(languages).get_date_data(raw).date_obj
+
+
+def _parse_candidate(
+    raw: str, pattern_id: int, languages: list[str], min_parts: list[str]
+) -> Optional[datetime]:
+    """Parse one scanner match; return it only if it is a valid date meeting `min_parts`."""
+    if pattern_id == _MONTH_YEAR_ID:
+        parsed = parse_month_year(raw)
+    elif pattern_id >= _FIRST_WORD_ID and not looks_like_date(raw):
+        parsed = None  # e.g. "12 items 2025": no month word, skip dateparser
+    else:
+        parsed = parse_numeric_date(raw, pattern_id) or _parse_cached(raw, tuple(languages))
+    if parsed and parsed.year >= 2020 and meets_minimum_parts(parsed, raw, min_parts):
+        return parsed
+    return None
+
+
+def iter_valid_dates(
     text: str, languages: list[str], min_parts: list[str]
-) -> list[tuple[datetime, str]]:
+) -> Iterator[tuple[datetime, str]]:
+    """
+    Scan the text once for all date patterns and yield the valid dates.
+
+    When a candidate does not parse or does not meet the requirements, scanning
+    resumes one character after its start. This way a spurious match (e.g. "0 date 01")
+    cannot hide a real date that overlaps it (e.g. "01/05/2025").
+
+    Args:
+        text: Input text to search.
+        languages: Language hints for `dateparser.parse`.
+        min_parts: Minimum required parts for a valid match.
+
+    Yields:
+        (parsed_datetime, raw_string) tuples, in document order.
+    """
+    pos = 0
+    while match := _DATE_SCANNER.search(text, pos):
+        raw = match.group()
+        parsed = _parse_candidate(raw, int(match.lastgroup[1:]), languages, min_parts)
+        if parsed:
+            yield parsed, raw
+            pos = match.end()
+        else:
+            pos = match.start() + 1
+
+
+class FoundDates(Sequence[tuple[datetime, str]]):
+    """
+    Unique dates found in a document, stored as parallel lists (structure of arrays).
+
+    Indexing and iteration yield (parsed_datetime, raw_string) tuples built on access;
+    `dates` and `raws` can also be used directly.
+    """
+
+    __slots__ = ("dates", "raws", "_seen")
+
+    def __init__(self) -> None:
+        self.dates: list[datetime] = []
+        self.raws: list[str] = []
+        self._seen: set[str] = set()
+
+    def add(self, parsed: datetime, raw: str) -> None:
+        """Append a date unless the same raw string was already added."""
+        if raw not in self._seen:
+            self._seen.add(raw)
+            self.dates.append(parsed)
+            self.raws.append(raw)
+
+    def extend(self, other: FoundDates) -> None:
+        """Append the dates of another result, skipping duplicates."""
+        for parsed, raw in zip(other.dates, other.raws):
+            self.add(parsed, raw)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(zip(self.dates[index], self.raws[index]))
+        return self.dates[index], self.raws[index]
+
+
+def find_all_dates(
+    text: str, languages: list[str], min_parts: list[str], limit: Optional[int] = None
+) -> FoundDates:
     """
     Find all date-like matches in the text and return parsed results.
 
@@ -176,29 +369,47 @@ def find_all_dates(
         text: Input text to search.
         languages: Language hints for `dateparser.parse`.
         min_parts: Minimum required parts for a valid match.
+        limit: Stop scanning once this many unique dates were found (None for all).
 
     Returns:
-        A list of (parsed_datetime, raw_string) tuples, in the order found.
+        The unique (parsed_datetime, raw_string) results, in document order.
     """
-    results: list[tuple[datetime, str]] = []
-    seen: set[str] = set()
+    results = FoundDates()
+    if not text or text.isspace():
+        return results
+
+    for parsed, match in iter_valid_dates(text, languages, min_parts):
+        results.add(parsed, match.strip())
+        if limit is not None and len(results) >= limit:
+            break
+    return results
 
-    for pattern in DATE_REGEXES:
-        for match in re.findall(pattern, text, flags=re.IGNORECASE):
-            if match in seen:
-                continue
 
-            parsed = parse_month_year(match) or parse(
-                match,
-                languages=languages,
-                settings={
-                    "PREFER_DAY_OF_MONTH": "first",
-                    "DATE_ORDER": "DMY",
-                },
-            )
-            if parsed and parsed.year >= 2020 and meets_minimum_parts(parsed, match, min_parts):
-                seen.add(match)
-                results.append((parsed, match.strip()))
+def find_all_dates_by_page(
+    pages: list[str], languages: list[str], min_parts: list[str]
+) -> FoundDates:
+    """
+    Find all dates across pages, parsing pages in parallel for long documents.
+
+    Small documents are handled in-process, because starting a process pool costs
+    more than it saves there.
+
+    Args:
+        pages: Text of each page, in page order.
+        languages: Language hints for `dateparser.parse`.
+        min_parts: Minimum required parts for a valid match.
+
+    Returns:
+        The unique (parsed_datetime, raw_string) results, in document order.
+    """
+    if len(pages) <= _PARALLEL_PAGE_THRESHOLD:
+        return find_all_dates("\f".join(pages), languages, min_parts)
+
+    results = FoundDates()
+    worker = partial(find_all_dates, languages=languages, min_parts=min_parts)
+    with ProcessPoolExecutor() as executor:
+        for page_dates in executor.map(worker, pages, chunksize=4):
+            results.extend(page_dates)
     return results
 
 
@@ -206,7 +417,7 @@ def extract_first_valid_date(
     fragment: str, languages: list[str], min_parts: list[str]
 ) -> Optional[tuple[datetime, str]]:
     """
-    Return the first valid (datetime, raw) date found in a text fragment.
+    Return the first valid (datetime, raw) date found in a text fragment, in document order.
 
     Args:
         fragment: The line or small text block to scan.
@@ -216,19 +427,8 @@ def extract_first_valid_date(
     Returns:
         The first (datetime, raw) tuple that meets requirements, else None.
     """
-    for pattern in DATE_REGEXES:
-        for match in re.finditer(pattern, fragment, flags=re.IGNORECASE):
-            raw = match.group()
-            parsed = parse_month_year(raw) or parse(
-                raw,
-                languages=languages,
-                settings={
-                    "PREFER_DAY_OF_MONTH": "first",
-                    "DATE_ORDER": "DMY",
-                },
-            )
-            if parsed and parsed.year >= 2020 and meets_minimum_parts(parsed, raw, min_parts):
-                return parsed, raw.strip()
+    for parsed, raw in iter_valid_dates(fragment, languages, min_parts):
+        return parsed, raw.strip()
     return None
 
 
@@ -236,7 +436,10 @@ def date_from_context(
     text: str, contexts: list[str], languages: list[str], min_parts: list[str]
 ) -> Optional[tuple[datetime, str]]:
     """
-    Find a date that appears on the same line as, or directly after, a context keyword.
+    Find a date that follows a context keyword on the same line, or on the next line.
+
+    The text is scanned once for date candidates. Each keyword hit then jumps, by
+    binary search, to the candidates between the keyword and the end of the next line.
 
     Args:
         text: Full text to scan.
@@ -247,21 +450,35 @@ def date_from_context(
     Returns:
         The first (datetime, raw) tuple near a context, else None.
     """
-    lines = text.splitlines()
-    lower_contexts = [c.lower() for c in contexts]
-
-    for i, line in enumerate(lines):
-        line_lower = line.lower()
-        if any(ctx in line_lower for ctx in lower_contexts):
-            # Check same line
-            result = extract_first_valid_date(line, languages, min_parts)
-            if result:
-                return result
-            # Check next line (if available)
-            if i + 1 < len(lines):
-                result = extract_first_valid_date(lines[i + 1], languages, min_parts)
-                if result:
-                    return result
+    if not contexts or not text or text.isspace():
+        return None
+    # All keywords fused into one alternation (longest first).
+    keywords = re.compile(
+        "|".join(re.escape(c) for c in sorted(contexts, key=len, reverse=True)),
+        flags=re.IGNORECASE,
+    )
+    if not keywords.search(text):
+        return None
+
+    candidates = [
+        (m.start(), int(m.lastgroup[1:]), m.group(m.lastgroup))
+        for m in _DATE_CANDIDATES.finditer(text)
+    ]
+    starts = [start for start, _, _ in candidates]
+    line_ends = list(accumulate(len(line) for line in text.splitlines(keepends=True)))
+
+    for keyword in keywords.finditer(text):
+        # Window: rest of the keyword's line, then the whole next line
+        line_idx = bisect_right(line_ends, keyword.start())
+        window_end = line_ends[min(line_idx + 1, len(line_ends) - 1)]
+        for start, pattern_id, raw in candidates[bisect_left(starts, keyword.end()) :]:
+            if start >= window_end:
+                break
+            if start + len(raw) > window_end:
+                continue
+            parsed = _parse_candidate(raw, pattern_id, languages, min_parts)
+            if parsed:
+                return parsed, raw.strip()
     return None
 
 
@@ -284,15 +501,20 @@ def format_with_template(dt: datetime, template: Optional[str]) -> str:
         The formatted date string.
     """
     if template:
-        return (
-            template.replace("YYYY", f"{dt.year:04d}")
-            .replace("MM", f"{dt.month:02d}")
-            .replace("DD", f"{dt.day:02d}")
+        return _compile_template(template).format(
+            YYYY=f"{dt.year:04d}", MM=f"{dt.month:02d}", DD=f"{dt.day:02d}"
         )
     return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}"
 
 
-def main() -> None:
+@lru_cache(maxsize=64)
+def _compile_template(template: str) -> str:
+    """Turn a YYYY/MM/DD template into a str.format string (literal braces escaped)."""
+    escaped = template.replace("{", "{{").replace("}", "}}")
+    return _TEMPLATE_TOKEN.sub(lambda m: "{" + m.group() + "}", escaped)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
     """CLI entrypoint to extract, list, or format dates from a PDF."""
     parser = argparse.ArgumentParser(
         description="Extract the nth date from a PDF and apply formatting."
@@ -308,23 +530,15 @@ def main() -> None:
         action="version",
         version=f"%(prog)s {get_version()}",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    min_parts = load_minimum_parts(args.pdf_file)
-    preferred = get_preferred_contexts(args.pdf_file)
+    sidecar = _load_sidecar(args.pdf_file)
+    min_parts = load_minimum_parts(args.pdf_file, sidecar)
+    preferred = get_preferred_contexts(args.pdf_file, sidecar)
     langs = ["en", "fr", "de", "es"]
 
     # Prefer sample_text from meta or env (useful for tests)
-    text = os.getenv("PDFDATE_FAKE_TEXT")
-    if not text:
-        meta_path = args.pdf_file.with_suffix(args.pdf_file.suffix + ".meta.json")
-        if meta_path.exists():
-            try:
-                with meta_path.open("r", encoding="utf-8") as handle:
-                    meta = json.load(handle)
-                    text = meta.get("sample_text", "")
-            except json.JSONDecodeError:
-                text = ""
+    text = os.getenv("PDFDATE_FAKE_TEXT") or sidecar.get("sample_text", "")
     if not text:
         try:
             text = extract_text_from_pdf(args.pdf_file)
@@ -345,8 +559,13 @@ def main() -> None:
             )
             return
 
-    # Otherwise, collect all dates and proceed
-    dates = find_all_dates(text, langs, min_parts)
+    # Otherwise, collect all dates and proceed. Extracted text separates pages with
+    # form feeds, which lets --list spread long documents across processes.
+    if args.list:
+        dates = find_all_dates_by_page(text.split("\f"), langs, min_parts)
+    else:
+        # Only the nth date is needed, so stop parsing once it is found
+        dates = find_all_dates(text, langs, min_parts, limit=max(args.nth, 0))
     if args.list:
         if dates:
             print(
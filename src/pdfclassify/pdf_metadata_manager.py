@@ -1,14 +1,30 @@
 """Module for managing sidecar metadata for PDFs using a JSON file."""
 
 import hashlib
-import json
+import mmap
+import numbers
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
-import numpy as np
-from pypdf import PdfReader
-from pypdf.errors import PdfReadError
+from pdfclassify._json_io import json_dumps, json_loads
+from pdfclassify._util import move_file
+
+# Entries kept in each per-process PDF cache before the least recently used is dropped
+_CACHE_SIZE = 256
+
+_CacheKey = tuple[str, int, int]
+
+
+def _remember(cache: OrderedDict, key: _CacheKey, value: object) -> None:
+    """Store value under key as the most recent entry, evicting the oldest beyond _CACHE_SIZE."""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
 
 
 @dataclass
@@ -31,34 +47,120 @@ class PDFMetadataManager:
     Sidecar is stored as <filename>.meta.json alongside the PDF.
     """
 
+    # PDFs already validated in this process, keyed by (path, st_mtime_ns, st_size).
+    _validated: OrderedDict[_CacheKey, None] = OrderedDict()
+    # SHA-256 digests already computed in this process, keyed the same way.
+    _hashes: OrderedDict[_CacheKey, str] = OrderedDict()
+
     def __init__(self, input_path: Path) -> None:
         self.input_path = input_path
-        self.sidecar_path = input_path.with_suffix(input_path.suffix + ".meta.json")
+        self.sidecar_path = input_path.with_name(input_path.name + ".meta.json")
+        # Parsed sidecar and the mtime it was read at
+        self._meta_cache: Optional[dict] = None
+        self._meta_mtime: Optional[int] = None
+        # Metadata waiting to be saved when the enclosing batch() block ends
+        self._batching = False
+        self._pending: Optional[dict] = None
 
         try:
-            PdfReader(str(input_path))
+            self._validate()
         except Exception as e:
+            # pypdf is only imported when needed, to keep CLI start-up fast
+            from pypdf.errors import PdfReadError  # pylint: disable=import-outside-toplevel
+
             raise PdfReadError(f"Invalid PDF file: {input_path}") from e
 
+    def _validate(self) -> None:
+        """
+        Check that the file looks like a PDF: a %PDF- header and a %%EOF marker near the end.
+
+        The file is mapped once and hashed in the same pass, since every sidecar write
+        needs the digest. Set PDFCLASSIFY_STRICT_PDF=1 to parse the whole file with pypdf
+        instead.
+        """
+        with self.input_path.open("rb") as f:
+            stat = os.fstat(f.fileno())
+            key = (os.path.abspath(self.input_path), stat.st_mtime_ns, stat.st_size)
+            if key in PDFMetadataManager._validated:
+                PDFMetadataManager._validated.move_to_end(key)
+                return
+            if os.environ.get("PDFCLASSIFY_STRICT_PDF") == "1":
+                from pypdf import PdfReader  # pylint: disable=import-outside-toplevel
+
+                PdfReader(f)
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if b"%PDF-" not in mapped[:1024] or b"%%EOF" not in mapped[-1024:]:
+                        raise ValueError("missing %PDF- header or %%EOF marker")
+                    digest = hashlib.sha256(mapped).hexdigest()
+                    _remember(PDFMetadataManager._hashes, key, digest)
+        _remember(PDFMetadataManager._validated, key, None)
+
     def _calculate_pdf_hash(self) -> str:
-        """Calculate SHA-256 hash of the PDF file."""
-        hasher = hashlib.sha256()
+        """Calculate SHA-256 hash of the PDF file, reusing it while the file is unchanged."""
         with self.input_path.open("rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+            stat = os.fstat(f.fileno())
+            key = (os.path.abspath(self.input_path), stat.st_mtime_ns, stat.st_size)
+            digest = PDFMetadataManager._hashes.get(key)
+            if digest is None:
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+            _remember(PDFMetadataManager._hashes, key, digest)
+        return digest
 
     def _load_metadata(self) -> dict:
-        if self.sidecar_path.exists():
-            with self.sidecar_path.open("r", encoding="utf-8") as f:
-                return json.load(f)
-        return {}
+        """
+        Load the sidecar, re-reading it only when its mtime has changed.
+
+        Callers get a copy, so edits only reach the cache once _save_metadata has written
+        them to disk.
+        """
+        if self._pending is not None:
+            return self._pending
+        try:
+            mtime = self.sidecar_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._meta_cache, self._meta_mtime = None, None
+            return {}
+        if self._meta_cache is None or mtime != self._meta_mtime:
+            self._meta_cache = json_loads(self.sidecar_path.read_bytes())
+            self._meta_mtime = mtime
+        return dict(self._meta_cache)
 
     def _save_metadata(self, metadata: dict) -> None:
-        """Save metadata to the sidecar file."""
+        """Save metadata to the sidecar file, or hold it until the current batch ends."""
+        if self._batching:
+            self._pending = metadata
+            return
         metadata["sha256"] = self._calculate_pdf_hash()
-        with self.sidecar_path.open("w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        # Write a temp file and rename it over the sidecar so a crash never leaves
+        # truncated JSON behind
+        tmp_path = self.sidecar_path.with_suffix(".tmp")
+        tmp_path.write_bytes(json_dumps(metadata, indent=True))
+        os.replace(tmp_path, self.sidecar_path)
+        self._meta_cache = metadata
+        self._meta_mtime = self.sidecar_path.stat().st_mtime_ns
+
+    @contextmanager
+    def batch(self) -> Iterator["PDFMetadataManager"]:
+        """
+        Defer sidecar saves until the block ends, so any number of field writes and
+        deletes cost a single write. Reads inside the block see the pending changes;
+        if the block raises, they are discarded and the sidecar is left untouched.
+        """
+        if self._batching:
+            yield self
+            return
+        self._batching = True
+        try:
+            yield self
+        except BaseException:
+            self._batching = False
+            self._pending = None
+            raise
+        self._batching = False
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self._save_metadata(pending)
 
     def print_metadata(self) -> None:
         """Print the metadata in a visually enhanced format."""
@@ -113,24 +215,54 @@ class PDFMetadataManager:
         Returns:
             bool: True if written, False if skipped
         """
-        metadata = self._load_metadata()
-        if not overwrite and field_name in metadata:
-            return False
+        return self.write_custom_fields({field_name: value}, overwrite=overwrite)
 
-        # Coerce value to JSON-safe types
-        if isinstance(value, (np.floating, float)):
-            value = float(value)
-        elif isinstance(value, (np.integer, int)):
-            value = int(value)
-        elif isinstance(value, list):
-            value = [str(v) for v in value]
-        else:
-            value = str(value)
+    def write_custom_fields(
+        self,
+        updates: dict[str, str | float | int | list[str]],
+        overwrite: bool = True,
+    ) -> bool:
+        """
+        Write or update several custom metadata fields with a single sidecar save.
 
-        metadata[field_name.lower()] = value
+        Args:
+            updates (dict): Field names mapped to the values to set
+            overwrite (bool): If False, fields that already exist are left untouched
 
-        self._save_metadata(metadata)
-        return True
+        Returns:
+            bool: True if any field was written, False if all were skipped
+        """
+        metadata = self._load_metadata()
+        written = changed = False
+        for field_name, value in updates.items():
+            key = field_name.lower()
+            if not overwrite and key in metadata:
+                continue
+            value = self._coerce(value)
+            written = True
+            if key not in metadata or metadata[key] != value:
+                metadata[key] = value
+                changed = True
+
+        # Re-writing values the sidecar already holds needs no save, unless the PDF
+        # itself changed and the stored digest must be refreshed
+        if changed or (written and metadata.get("sha256") != self._calculate_pdf_hash()):
+            self._save_metadata(metadata)
+        return written
+
+    @staticmethod
+    def _coerce(value: object) -> str | float | int | list[str]:
+        """Coerce a value to a JSON-safe type."""
+        # Unwrap 0-d array-library scalars (numpy, torch, pandas) without importing them
+        if hasattr(value, "item") and getattr(value, "ndim", None) == 0:
+            value = value.item()
+        if isinstance(value, numbers.Integral):
+            return int(value)
+        if isinstance(value, numbers.Real):
+            return float(value)
+        if isinstance(value, list):
+            return [str(v) for v in value]
+        return str(value)
 
     def delete_custom_field(self, field_name: str) -> None:
         """
@@ -161,18 +293,19 @@ class PDFMetadataManager:
         if new_pdf_path.suffix.lower() != ".pdf":
             new_pdf_path = new_pdf_path.with_suffix(".pdf")
 
-        new_sidecar_path = new_pdf_path.with_suffix(new_pdf_path.suffix + ".meta.json")
+        new_sidecar_path = new_pdf_path.with_name(new_pdf_path.name + ".meta.json")
 
-        # Ensure target directory exists
-        new_pdf_path.parent.mkdir(parents=True, exist_ok=True)
+        # Ensure target directory exists; renames within the folder, as restore does, skip it
+        if new_pdf_path.parent != self.input_path.parent:
+            new_pdf_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Check sidecar validity before renaming
         if self.sidecar_path.exists():
             if not self.verify_pdf_hash():
                 raise ValueError(f"PDF hash does not match metadata in {self.sidecar_path}")
-            self.sidecar_path.rename(new_sidecar_path)
+            move_file(self.sidecar_path, new_sidecar_path)
 
-        self.input_path.rename(new_pdf_path)
+        move_file(self.input_path, new_pdf_path)
 
         # Update internal state
         self.input_path = new_pdf_path
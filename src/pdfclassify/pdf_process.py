@@ -9,19 +9,29 @@ Manipulate the name and/or metadata of a PDF file.
 - Renames or moves PDF (and its sidecar) according to classification rules.
 """
 
+import ctypes
 import os
-import shutil
-import subprocess
+import stat
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import Callable, Iterable, Optional
 
 from pypdf.errors import PdfReadError
 
-from pdfclassify._util import CONFIG, MyException
+from pdfclassify._util import CONFIG, MyException, move_file
 from pdfclassify.argument_handler import ParsedArgs
 from pdfclassify.label_boost_manager import LabelBoostManager
 from pdfclassify.pdf_metadata_manager import PDFMetadataManager
-from pdfclassify.pdf_semantic_classifier import Classification, PDFSemanticClassifier
+from pdfclassify.pdf_semantic_classifier import (
+    Classification,
+    PDFSemanticClassifier,
+    set_inference_threads,
+)
+
+# Trained classifier shared by every task of a process_many() worker
+_worker_classifier: Optional[PDFSemanticClassifier] = None  # pylint: disable=invalid-name
 
 
 class PdfProcess:
@@ -29,23 +39,23 @@ class PdfProcess:
 
     def __init__(self, pdf_path: str):
         self.pdf_file = Path(pdf_path)
-        if not self.pdf_file.is_file():
+        self._pdf_manager: Optional[PDFMetadataManager] = None
+        # One stat serves the existence check, the placeholder check and original_date
+        try:
+            self._stat = self.pdf_file.stat()
+        except OSError:
+            self._stat = None
+        if self._stat is None or not stat.S_ISREG(self._stat.st_mode):
             raise MyException(f"File {pdf_path} does not exist", 1)
 
         # ── Skip zero-length iCloud placeholder PDFs ──
         try:
-            size = self.pdf_file.stat().st_size
-            try:
-                xattrs = os.listxattr(self.pdf_file)
-            except (AttributeError, NotImplementedError):
-                raw = subprocess.check_output(
-                    ["xattr", str(self.pdf_file)], stderr=subprocess.DEVNULL
-                )
-                xattrs = raw.decode("utf-8", errors="ignore").splitlines()
-            if size == 0 and "com.apple.placeholder" in xattrs:
-                raise MyException(f"Skipping zero-length placeholder PDF: {pdf_path}", 4)
+            # Only empty files can be placeholders, so real PDFs skip the xattr lookup
+            if self._stat.st_size == 0:
+                if "com.apple.placeholder" in self._listxattr_safe(self.pdf_file):
+                    raise MyException(f"Skipping zero-length placeholder PDF: {pdf_path}", 4)
         except OSError:
-            pass  # ignore stat errors
+            pass  # ignore xattr errors
 
         # Save original metadata
         try:
@@ -53,19 +63,57 @@ class PdfProcess:
         except PdfReadError as e:
             raise MyException(f"Invalid PDF file: {e}", 2) from e
 
+    @staticmethod
+    def _listxattr_safe(path: Path) -> list[str]:
+        """List extended attribute names without forking a helper process."""
+        try:
+            return os.listxattr(path)
+        except (AttributeError, NotImplementedError):
+            return _libc_listxattr(path)
+
+    @classmethod
+    def process_many(cls, paths: Iterable[str | Path], args: ParsedArgs) -> list[str]:
+        """Classify several PDFs in parallel worker processes; return any error messages."""
+        pdf_paths = [str(p) for p in paths]
+        # Train here so the workers only load the saved embeddings; they get the training
+        # folder rather than a pickled classifier and model
+        cls.train_classifier(args)
+        cpus = os.cpu_count() or 1
+        workers = max(1, min(cpus, len(pdf_paths)))
+        # Each worker encodes on its own share of the cores rather than every worker
+        # starting a full-size PyTorch thread pool
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_set_classifier,
+            initargs=(args.training_data_path, cpus // workers),
+        ) as executor:
+            results = executor.map(partial(_process_one, args=args), pdf_paths, chunksize=4)
+            return [message for message in results if message]
+
+    @staticmethod
+    def train_classifier(args: ParsedArgs) -> PDFSemanticClassifier:
+        """Return the classifier for this training folder, built once per process."""
+        return _get_classifier(args.training_data_path)
+
     def display_info(self) -> None:
         """Display PDF metadata."""
-        PDFMetadataManager(self.pdf_file).print_metadata()
+        self._manager().print_metadata()
+
+    def _manager(self) -> PDFMetadataManager:
+        """Return the metadata manager for this PDF, creating it on first use."""
+        if self._pdf_manager is None:
+            self._pdf_manager = PDFMetadataManager(self.pdf_file)
+        return self._pdf_manager
 
     def _save_metadata(self) -> None:
         """Write original_filename and original_date if not already present."""
         try:
-            pdf_manager = PDFMetadataManager(self.pdf_file)
-            mod_date = datetime.fromtimestamp(self.pdf_file.stat().st_mtime).isoformat()
-            if pdf_manager.read_custom_field("original_filename") is None:
-                pdf_manager.write_custom_field("original_filename", self.pdf_file.name)
-            if pdf_manager.read_custom_field("original_date") is None:
-                pdf_manager.write_custom_field("original_date", mod_date)
+            pdf_manager = self._manager()
+            mod_date = datetime.fromtimestamp(self._stat.st_mtime).isoformat()
+            pdf_manager.write_custom_fields(
+                {"original_filename": self.pdf_file.name, "original_date": mod_date},
+                overwrite=False,
+            )
         except PdfReadError as e:
             raise MyException(f"Invalid PDF file: {e}", 2) from e
         except Exception as e:
@@ -73,7 +121,7 @@ class PdfProcess:
 
     def restore_original_state(self) -> None:
         """Restore filename and timestamp from sidecar metadata fields."""
-        pdf_manager = PDFMetadataManager(self.pdf_file)
+        pdf_manager = self._manager()
 
         orig_name = pdf_manager.read_custom_field("original_filename")
         orig_date = pdf_manager.read_custom_field("original_date")
@@ -83,16 +131,19 @@ class PdfProcess:
             new_path = self.pdf_file.with_name(orig_name)
             self.pdf_file = pdf_manager.rename_with_sidecar(new_path)
 
-        # Restore timestamp if present
+        # Restore timestamp if present; a rename keeps the mtime, so the stat taken at
+        # start-up still tells whether the file already carries it
         if orig_date:
-            ts = datetime.fromisoformat(orig_date).timestamp()
-            os.utime(self.pdf_file, (ts, ts))
+            ts_ns = _timestamp_ns(datetime.fromisoformat(orig_date))
+            if self._stat.st_mtime_ns != ts_ns:
+                os.utime(self.pdf_file, ns=(ts_ns, ts_ns))
+                self._stat = self.pdf_file.stat()
 
-    def predict(self, args: ParsedArgs) -> None:
+    def predict(self, args: ParsedArgs, classifier: Optional[PDFSemanticClassifier] = None) -> None:
         """Predict the label using trained classifier; queue empty-text PDFs for OCR."""
-        pdf_manager = PDFMetadataManager(self.pdf_file)
-        classifier = PDFSemanticClassifier(data_dir=args.training_data_path)
-        classifier.train()
+        pdf_manager = self._manager()
+        if classifier is None:
+            classifier = self.train_classifier(args)
         try:
             label = classifier.predict(
                 pdf_path=str(self.pdf_file),
@@ -103,12 +154,8 @@ class PdfProcess:
                 print(f"⚠️ Skipping '{self.pdf_file.name}': no text extracted. Queuing for 2OCR.")
                 queue_dir = self.pdf_file.parent / "pdfclassify.2ocr"
                 queue_dir.mkdir(parents=True, exist_ok=True)
-                dest = queue_dir / self.pdf_file.name
-                counter = 1
-                while dest.exists():
-                    dest = queue_dir / f"{self.pdf_file.stem}_{counter}.pdf"
-                    counter += 1
-                shutil.move(str(self.pdf_file), dest)
+                dest = _next_free(queue_dir, self.pdf_file.stem)
+                _move_to_reserved(partial(move_file, self.pdf_file), dest)
                 print(f"File moved to: {dest}")
                 return
             raise
@@ -116,33 +163,25 @@ class PdfProcess:
         # Regular processing
         print(f"Predicted label: {label.label} with confidence {label.confidence:.2f}")
         if label.success:
-            pdf_manager.write_custom_field(
-                field_name="classification", value=label.label, overwrite=True
-            )
-            pdf_manager.write_custom_field(
-                field_name="confidence", value=label.confidence, overwrite=True
-            )
+            updates = {"classification": label.label, "confidence": label.confidence}
 
             boost_manager = LabelBoostManager()
             config = boost_manager.get(label.label)
 
             # ✅ Save preferred_context
             if config.preferred_context:
-                pdf_manager.write_custom_field(
-                    field_name="/preferred_context", value=config.preferred_context, overwrite=True
-                )
+                updates["/preferred_context"] = config.preferred_context
 
             # ✅ Save minimum_parts
             if config.minimum_parts:
-                pdf_manager.write_custom_field(
-                    field_name="minimum_parts", value=config.minimum_parts, overwrite=True
-                )
+                updates["minimum_parts"] = config.minimum_parts
 
             # ✅ NEW: Save devonthink_group if present
             if config.devonthink_group:
-                pdf_manager.write_custom_field(
-                    field_name="devonthink_group", value=config.devonthink_group, overwrite=True
-                )
+                updates["devonthink_group"] = config.devonthink_group
+
+            # One sidecar load/hash/save for all fields
+            pdf_manager.write_custom_fields(updates, overwrite=True)
 
         # ✅ Rename/move file as needed
         new_path = self.take_action(
@@ -163,7 +202,7 @@ class PdfProcess:
         if not rename:
             return None
 
-        pdf_manager = PDFMetadataManager(self.pdf_file)
+        pdf_manager = self._manager()
 
         if prediction.success:
             base = output_path or self.pdf_file.parent
@@ -180,12 +219,100 @@ class PdfProcess:
         stem = Path(stem).stem
 
         # Ensure unique file name
-        dest = base / f"{stem}.pdf"
-        counter = 1
-        while dest.exists():
-            dest = base / f"{stem}_{counter}.pdf"
-            counter += 1
+        dest = _next_free(base, stem)
 
         # Rename PDF and sidecar together
-        pdf_manager.rename_with_sidecar(dest)
+        _move_to_reserved(pdf_manager.rename_with_sidecar, dest)
         return dest
+
+
+@lru_cache(maxsize=8)
+def _get_classifier(data_dir: str) -> PDFSemanticClassifier:
+    """Build a classifier, retraining only if the training data changed."""
+    classifier = PDFSemanticClassifier(data_dir=data_dir)
+    if classifier.needs_retrain():
+        classifier.train()
+    return classifier
+
+
+@lru_cache(maxsize=1)
+def _libc() -> ctypes.CDLL:
+    """Load the C library once, with listxattr returning ssize_t."""
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.listxattr.restype = ctypes.c_ssize_t
+    return libc
+
+
+def _libc_listxattr(path: Path) -> list[str]:
+    """Call listxattr(2) through ctypes where os.listxattr is missing (macOS)."""
+    libc = _libc()
+    encoded = os.fsencode(path)
+    # The trailing options argument is macOS-specific; other platforms ignore it
+    size = libc.listxattr(encoded, None, ctypes.c_size_t(0), 0)
+    if size > 0:
+        buffer = ctypes.create_string_buffer(size)
+        size = libc.listxattr(encoded, buffer, ctypes.c_size_t(size), 0)
+    if size < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno), str(path))
+    if size == 0:
+        return []
+    names = buffer.raw[:size].split(b"\0")
+    return [name.decode("utf-8", errors="ignore") for name in names if name]
+
+
+def _next_free(base: Path, stem: str) -> Path:
+    """
+    Reserve base/stem.pdf, or the first free base/stem_N.pdf, and return it.
+
+    The name is claimed by creating an empty placeholder with O_EXCL, so parallel
+    process_many workers never pick the same destination; the caller's rename then
+    replaces the placeholder. One directory scan skips the names already taken.
+    """
+    with os.scandir(base) as entries:
+        existing = {entry.name for entry in entries}
+    name = f"{stem}.pdf"
+    counter = 1
+    while True:
+        if name not in existing:
+            try:
+                os.close(os.open(base / name, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return base / name
+            except FileExistsError:
+                pass  # claimed since the scan
+        name = f"{stem}_{counter}.pdf"
+        counter += 1
+
+
+def _move_to_reserved(move: Callable[[Path], object], dest: Path) -> None:
+    """Run move(dest) into a name reserved by _next_free, releasing it if the move fails."""
+    try:
+        move(dest)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+
+
+def _timestamp_ns(moment: datetime) -> int:
+    """Convert a datetime to integer epoch nanoseconds without a float round-trip."""
+    seconds = int(moment.replace(microsecond=0).timestamp())
+    return seconds * 1_000_000_000 + moment.microsecond * 1_000
+
+
+def _set_classifier(data_dir: str, threads: int = 0) -> None:
+    """Pool initializer: load the trained classifier and set the thread budget once per worker."""
+    global _worker_classifier  # pylint: disable=global-statement
+    if threads:
+        set_inference_threads(threads)
+    _worker_classifier = _get_classifier(data_dir)
+
+
+def _process_one(pdf_path: str, args: ParsedArgs) -> str | None:
+    """Worker entry point: classify one PDF and return an error message on failure."""
+    try:
+        PdfProcess(pdf_path).predict(args, _worker_classifier)
+    # Text extraction and an empty model raise ValueError/RuntimeError; one bad PDF
+    # must not abort the rest of the batch
+    except (MyException, ValueError, RuntimeError, OSError) as e:
+        return f"{pdf_path}: {e}"
+    return None
@@ -2,25 +2,115 @@
 optional label boosts for classification."""
 
 import hashlib
-import json
+import io
 import logging
-from json import JSONDecodeError
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
 from typing import List
 
-import joblib
 import numpy as np
+import pymupdf
 import torch
-from pdfminer.high_level import extract_text
-from pdfminer.pdfparser import PDFSyntaxError
 from platformdirs import user_cache_dir, user_log_dir
 from sentence_transformers import SentenceTransformer
 
+from pdfclassify._json_io import JSONDecodeError, json_dumps, json_loads
 from pdfclassify._util import CONFIG
 from pdfclassify.label_boost_manager import LabelBoostManager
 
-logging.getLogger("pdfminer").setLevel(logging.ERROR)
+EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# The embedder truncates to 128 tokens; 4 KiB of text covers several times that, so
+# cutting here only saves tokenizing pages the model would ignore anyway
+_MAX_EMBED_CHARS = 4096
+
+# Below this many stale training PDFs, worker start-up costs more than it saves
+_PARALLEL_EXTRACT_THRESHOLD = 4
+
+
+@lru_cache(maxsize=4)
+def _get_embedder(
+    name: str, device: str, backend: str = "torch", model_file: str | None = None
+) -> SentenceTransformer:
+    """Load a sentence-transformer once per process and share it between classifiers."""
+    if backend == "torch":
+        return SentenceTransformer(name, device=device)
+    # model_file selects an alternative export, e.g. an int8-quantized ONNX file
+    model_kwargs = {"file_name": model_file} if model_file else {}
+    if backend == "onnx":
+        model_kwargs["provider"] = (
+            "CUDAExecutionProvider" if device == "cuda" else "CPUExecutionProvider"
+        )
+    return SentenceTransformer(
+        name, device=device, backend=backend, model_kwargs=model_kwargs or None
+    )
+
+
+def set_inference_threads(threads: int) -> None:
+    """Cap PyTorch's intra-op threads, e.g. when several worker processes share the CPU."""
+    torch.set_num_threads(max(1, threads))
+
+
+def _stat_matches(previous: dict | str | None, stat: os.stat_result) -> bool:
+    """True if a file_stats.json entry still describes the file's size and mtime."""
+    return (
+        isinstance(previous, dict)
+        and previous.get("size") == stat.st_size
+        and previous.get("mtime_ns") == stat.st_mtime_ns
+    )
+
+
+def _extract_text(pdf_path: str | Path) -> str:
+    """Extract a PDF's text with MuPDF, reporting unparseable files as ValueError.
+
+    The file is read here so that OS errors (missing file, permissions) propagate
+    unchanged rather than being mistaken for a malformed PDF.
+    """
+    with open(pdf_path, "rb") as fh:
+        data = fh.read()
+    try:
+        with pymupdf.open(stream=data, filetype="pdf") as doc:
+            # Separate pages with form feeds, as pdfminer did
+            return "\f".join(page.get_text() for page in doc)
+    except RuntimeError as mupdf_error:  # includes pymupdf.FileDataError
+        # pdfminer is slower but tolerates some malformed files MuPDF rejects
+        # pylint: disable=import-outside-toplevel
+        from pdfminer.high_level import extract_text
+        from pdfminer.psparser import PSException
+
+        try:
+            return extract_text(io.BytesIO(data))
+        except (PSException, ValueError) as exc:
+            raise ValueError(f"Failed to extract PDF: {mupdf_error}") from exc
+
+
+def _try_extract_text(pdf_path: Path) -> tuple[str, str | None]:
+    """Pool-friendly wrapper: return (text, None) or ("", error message)."""
+    try:
+        return _extract_text(pdf_path), None
+    except ValueError as exc:
+        return "", str(exc)
+
+
+def _fingerprint(entry: dict | str | None) -> str | None:
+    """Change fingerprint from a file_stats.json entry (older files stored bare strings)."""
+    return entry.get("fp") if isinstance(entry, dict) else entry
+
+
+@lru_cache(maxsize=4)
+def _load_model_file(
+    matrix_path: str, index_path: str, mtime_ns: tuple[int, int]  # pylint: disable=unused-argument
+) -> tuple[np.ndarray, list[str], list[str]]:
+    """Memory-map the embedding matrix and read its row index, until either file changes."""
+    index = json_loads(Path(index_path).read_bytes())
+    matrix = np.load(matrix_path, mmap_mode="r")
+    if not len(index["paths"]) == len(index["labels"]) == matrix.shape[0]:
+        raise ValueError(f"{index_path} does not describe the rows of {matrix_path}")
+    return matrix, index["paths"], index["labels"]
 
 
 # pylint: disable=too-few-public-methods
@@ -44,16 +134,17 @@ class PDFSemanticClassifier:
     def __init__(self, data_dir: str, cache_name: str = "semantic_pdf_classifier"):
         self.data_dir = Path(data_dir)
         self.cache_dir = Path(user_cache_dir()) / CONFIG.org / CONFIG.app / cache_name
-        self.model_path = self.cache_dir / "model.joblib"
-        self.hash_path = self.cache_dir / "file_hashes.json"
-        self.embeddings_dir = self.cache_dir / "embeddings"
+        # Unit-length float32 embeddings, one row per training PDF, and the row index
+        self.model_path = self.cache_dir / "embeddings.npy"
+        self.index_path = self.cache_dir / "embeddings_index.json"
+        self.hash_path = self.cache_dir / "file_stats.json"
+        self.legacy_hash_path = self.cache_dir / "file_hashes.json"
         self.labels: List[str] = []
         self.doc_vectors = None
         self.logger = self._setup_logger()
         self.boosts = LabelBoostManager(self.logger)
 
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.embeddings_dir.mkdir(exist_ok=True, parents=True)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
         device = (
@@ -61,7 +152,14 @@ class PDFSemanticClassifier:
             if torch.cuda.is_available()
             else ("mps" if torch.backends.mps.is_available() else "cpu")
         )
-        self.embedder = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2", device=device)
+        self.embedder = _get_embedder(
+            EMBEDDING_MODEL, device, CONFIG.embedding_backend, CONFIG.embedding_model_file
+        )
+        # Quantized or alternative exports give different vectors, so cached rows are
+        # only reused when they came from the same embedder
+        self.embedder_id = "|".join(
+            (EMBEDDING_MODEL, CONFIG.embedding_backend, CONFIG.embedding_model_file or "")
+        )
 
     def _setup_logger(self) -> logging.Logger:
         """Configure a rotating file logger."""
@@ -81,19 +179,120 @@ class PDFSemanticClassifier:
             logger.propagate = False
         return logger
 
-    def _compute_file_hash(self, path: Path) -> str:
-        """Compute a hash of the contents and modification time of a file."""
-        hash_md5 = hashlib.md5()
-        with path.open("rb") as file:
-            for chunk in iter(lambda: file.read(4096), b""):
-                hash_md5.update(chunk)
-        hash_md5.update(str(path.stat().st_mtime).encode())
-        return hash_md5.hexdigest()
+    @staticmethod
+    def _compute_file_hash(path: Path, stat: os.stat_result) -> str:
+        """
+        Fingerprint a file for change detection from its size and modification time.
 
-    def _embedding_path(self, file_path: str) -> Path:
-        """Get path to cached embedding for a given file."""
-        file_hash = hashlib.md5(file_path.encode()).hexdigest()
-        return self.embeddings_dir / f"{file_hash}.joblib"
+        Set PDFCLASSIFY_FORCE_HASH=1 to hash the contents instead, for file systems
+        whose mtimes cannot be trusted.
+        """
+        if os.environ.get("PDFCLASSIFY_FORCE_HASH") != "1":
+            return f"{stat.st_size}:{stat.st_mtime_ns}"
+        with path.open("rb") as file:
+            return hashlib.file_digest(file, "blake2b").hexdigest()
+
+    def _file_entry(self, path: Path, previous: dict | str | None) -> dict:
+        """Return the file's {"fp", "size", "mtime_ns"} entry, reusing it if its stat matches."""
+        stat = path.stat()
+        if os.environ.get("PDFCLASSIFY_FORCE_HASH") != "1" and _stat_matches(previous, stat):
+            return previous
+        return {
+            "fp": self._compute_file_hash(path, stat),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def _load_rows(self) -> tuple[np.ndarray | None, dict[str, int]]:
+        """Return the cached embedding matrix and its path -> row mapping, if readable."""
+        if not self.model_path.exists() or not self.index_path.exists():
+            return None, {}
+        try:
+            matrix, paths, _ = self._load_model_files()
+            embedder_id = json_loads(self.index_path.read_bytes()).get("embedder")
+        except (OSError, ValueError, KeyError) as exc:
+            self.logger.warning("Ignoring unreadable embedding cache: %s", exc)
+            return None, {}
+        if embedder_id != self.embedder_id:
+            self.logger.info("Embedder changed, re-embedding all training PDFs")
+            return None, {}
+        return matrix, {path: row for row, path in enumerate(paths)}
+
+    def _load_model_files(self) -> tuple[np.ndarray, list[str], list[str]]:
+        """Return the embedding matrix, row paths and row labels, cached per file version."""
+        mtimes = (self.model_path.stat().st_mtime_ns, self.index_path.stat().st_mtime_ns)
+        return _load_model_file(str(self.model_path), str(self.index_path), mtimes)
+
+    def _save_rows(self, vectors: np.ndarray | None, paths: List[str], labels: List[str]) -> None:
+        """
+        Atomically replace the embedding matrix and its row index.
+
+        The index is written last: it is the commit point, so an interrupted save leaves
+        an index that no longer matches the matrix and is rejected on load.
+        """
+        if vectors is None:
+            self.model_path.unlink(missing_ok=True)
+            self.index_path.unlink(missing_ok=True)
+            return
+        tmp_matrix = self.model_path.with_suffix(".tmp.npy")
+        np.save(tmp_matrix, vectors)
+        tmp_index = self.index_path.with_suffix(".tmp")
+        tmp_index.write_bytes(
+            json_dumps(
+                {
+                    "data_dir": str(self.data_dir),
+                    "embedder": self.embedder_id,
+                    "paths": paths,
+                    "labels": labels,
+                }
+            )
+        )
+        os.replace(tmp_matrix, self.model_path)
+        os.replace(tmp_index, self.index_path)
+
+    def _remove_legacy_cache(self) -> None:
+        """Delete the per-file joblib embeddings and model written by older versions."""
+        shutil.rmtree(self.cache_dir / "embeddings", ignore_errors=True)
+        (self.cache_dir / "model.joblib").unlink(missing_ok=True)
+        self.legacy_hash_path.unlink(missing_ok=True)
+
+    def needs_retrain(self) -> bool:
+        """
+        Cheap freshness check: True if the cache is missing or any training PDF changed.
+
+        Every PDF's size and mtime are compared with file_stats.json, so files added,
+        removed or overwritten in place are all noticed without reading their contents.
+        """
+        paths = (self.model_path, self.index_path, self.hash_path)
+        if not all(path.exists() for path in paths):
+            return True
+        try:
+            index = json_loads(self.index_path.read_bytes())
+            if index.get("data_dir") != str(self.data_dir):
+                return True  # cache was built from another training folder
+            if index.get("embedder") != self.embedder_id:
+                return True  # cached vectors came from a different model export
+            if len(index["paths"]) != np.load(self.model_path, mmap_mode="r").shape[0]:
+                return True  # a save was interrupted between the matrix and the index
+        except (OSError, ValueError, KeyError):
+            return True
+        return self._training_files_changed()
+
+    def _training_files_changed(self) -> bool:
+        """True if any training PDF was added, removed or rewritten since file_stats.json."""
+        try:
+            stored = json_loads(self.hash_path.read_bytes())
+        except (OSError, ValueError):
+            return True
+        seen = 0
+        for label_dir in self.data_dir.iterdir():
+            if not label_dir.is_dir():
+                continue
+            for pdf_file in label_dir.glob("*.pdf"):
+                if not _stat_matches(stored.get(str(pdf_file)), pdf_file.stat()):
+                    return True
+                seen += 1
+        return seen != len(stored)
 
     def train(self) -> None:  # pylint: disable=too-many-locals, too-many-branches
         """Train or update the model from persistent embeddings."""
@@ -105,17 +304,19 @@ class PDFSemanticClassifier:
                     self.logger.warning("Could not remove %s: %s", label_dir, exc)
 
         previous_hashes = {}
-        if self.hash_path.exists():
+        # Entries from the older file_hashes.json still carry size and mtime_ns, so
+        # unchanged files keep their cached rows across the rename
+        hash_path = self.hash_path if self.hash_path.exists() else self.legacy_hash_path
+        if hash_path.exists():
             try:
-                with self.hash_path.open("r", encoding="utf-8") as f:
-                    previous_hashes = json.load(f)
+                previous_hashes = json_loads(hash_path.read_bytes())
             except (JSONDecodeError, ValueError):
-                self.logger.warning("Invalid JSON in %s, starting fresh", self.hash_path)
+                self.logger.warning("Invalid JSON in %s, starting fresh", hash_path)
 
         updated_hashes = {}
-        embeddings: List[np.ndarray] = []
-        labels: List[str] = []
-        all_current_files = set()
+        files: List[tuple[str, str]] = []
+        stale: List[Path] = []
+        cached_matrix, cached_rows = self._load_rows()
 
         for label_dir in self.data_dir.iterdir():
             if not label_dir.is_dir():
@@ -123,95 +324,126 @@ class PDFSemanticClassifier:
             label = label_dir.name
             for pdf_file in label_dir.glob("*.pdf"):
                 file_path_str = str(pdf_file)
-                all_current_files.add(file_path_str)
-                file_hash = self._compute_file_hash(pdf_file)
-                updated_hashes[file_path_str] = file_hash
-                embed_path = self._embedding_path(file_path_str)
-
-                if previous_hashes.get(file_path_str) != file_hash or not embed_path.exists():
-                    try:
-                        text = extract_text(pdf_file)
-                        if text.strip():
-                            vec = self.embedder.encode([text], convert_to_numpy=True)[0]
-                            joblib.dump((vec, label), embed_path)
-                    except (OSError, ValueError, PDFSyntaxError) as exc:
-                        self.logger.warning("Embedding failed for %s: %s", pdf_file, exc)
-
-                if embed_path.exists():
-                    try:
-                        vec, lbl = joblib.load(embed_path)
-                        embeddings.append(vec)
-                        labels.append(lbl)
-                    except (
-                        EOFError,
-                        joblib.externals.loky.process_executor.TerminatedWorkerError,
-                    ) as exc:
-                        self.logger.warning("Failed to load embedding: %s", exc)
-
-        for deleted_path in set(previous_hashes) - all_current_files:
-            embed = self._embedding_path(deleted_path)
-            if embed.exists():
-                embed.unlink()
-
-        self.doc_vectors = np.stack(embeddings) if embeddings else None
+                previous = previous_hashes.get(file_path_str)
+                entry = self._file_entry(pdf_file, previous)
+                updated_hashes[file_path_str] = entry
+                files.append((file_path_str, label))
+
+                if _fingerprint(previous) != entry["fp"] or file_path_str not in cached_rows:
+                    stale.append(pdf_file)
+
+        new_vectors = self._embed_files(stale) if stale else {}
+
+        # Assemble rows in directory order: fresh embeddings first, else the cached row
+        rows: List[np.ndarray] = []
+        paths: List[str] = []
+        labels: List[str] = []
+        for file_path_str, label in files:
+            if file_path_str in new_vectors:
+                rows.append(new_vectors[file_path_str])
+            elif file_path_str in cached_rows:
+                rows.append(cached_matrix[cached_rows[file_path_str]])
+            else:
+                continue
+            paths.append(file_path_str)
+            labels.append(label)
+
+        for file_path_str in new_vectors:
+            self.logger.info("Updated embedding: %s", file_path_str)
+        for file_path_str in cached_rows.keys() - set(paths):
+            self.logger.info("Removed embedding: %s", file_path_str)
+
+        self.doc_vectors = np.stack(rows).astype(np.float32) if rows else None
         self.labels = labels
+        if new_vectors or list(cached_rows) != paths:
+            self._save_rows(self.doc_vectors, paths, labels)
+        self._remove_legacy_cache()
+
+        self.hash_path.write_bytes(json_dumps(updated_hashes))
+
+    def _embed_files(self, pdf_files: List[Path]) -> dict[str, np.ndarray]:
+        """Extract stale PDFs (in parallel when there are several), then encode in one batch."""
+        if len(pdf_files) >= _PARALLEL_EXTRACT_THRESHOLD:
+            workers = min(os.cpu_count() or 1, len(pdf_files))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Small chunks keep workers busy when PDF sizes vary a lot
+                extracted = list(executor.map(_try_extract_text, pdf_files, chunksize=4))
+        else:
+            extracted = [_try_extract_text(pdf_file) for pdf_file in pdf_files]
+
+        pending = []
+        for pdf_file, (text, error) in zip(pdf_files, extracted):
+            if error:
+                self.logger.warning("Embedding failed for %s: %s", pdf_file, error)
+            elif text.strip():
+                pending.append((str(pdf_file), text[:_MAX_EMBED_CHARS]))
+        if not pending:
+            return {}
 
-        joblib.dump((self.doc_vectors, self.labels), self.model_path)
-        with self.hash_path.open("w", encoding="utf-8") as f:
-            json.dump(updated_hashes, f)
+        try:
+            vectors = self.embedder.encode(
+                [text for _, text in pending],
+                batch_size=64,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        except (OSError, ValueError) as exc:
+            self.logger.warning("Embedding failed for %d files: %s", len(pending), exc)
+            return {}
+        return {path: vec for (path, _), vec in zip(pending, vectors)}
 
     def _load_cached_model(self) -> None:
-        """Load model vectors and labels from disk."""
-        self.doc_vectors, self.labels = joblib.load(self.model_path)
+        """Memory-map the model vectors and load their labels from disk."""
+        self.doc_vectors, _, self.labels = self._load_model_files()
 
     def predict(
         self, pdf_path: str, confidence_threshold: float = 0.75
     ) -> Classification:  # pylint: disable=too-many-locals
         """Predict the label for a PDF based on cosine similarity and optional boost."""
         # pylint: disable=too-many-locals
-        try:
-            text = extract_text(pdf_path)
-        except (PDFSyntaxError, OSError, ValueError) as exc:
-            raise ValueError(f"Failed to extract PDF: {exc}") from exc
-
-        if not text.strip():
-            raise ValueError("PDF text is empty.")
-
+        # Get the model ready first so a cold start does not parse the query PDF
+        # only to discover there is nothing to compare it against.
         if not self.model_path.exists() or not self.hash_path.exists():
             self.train()
         elif self.doc_vectors is None or not self.labels:
             try:
                 self._load_cached_model()
-            except (EOFError, joblib.externals.loky.process_executor.TerminatedWorkerError):
+            except (OSError, ValueError, KeyError):
                 self.train()
 
         if self.doc_vectors is None:
             raise RuntimeError("Model is not trained.")
 
-        vec = self.embedder.encode([text], convert_to_numpy=True)
-        vec = vec / np.linalg.norm(vec, axis=1, keepdims=True)
-        doc_vecs = self.doc_vectors / np.linalg.norm(self.doc_vectors, axis=1, keepdims=True)
-        sims = np.dot(vec, doc_vecs.T)[0]
+        text = _extract_text(pdf_path)
+        if not text.strip():
+            raise ValueError("PDF text is empty.")
 
-        # Apply boosts without clamping
-        boosted_sims = []
-        for i, label in enumerate(self.labels):
-            boost = self.boosts.boost_score(label, text)
-            raw_score = sims[i]
-            boosted_score = raw_score + boost
-            boosted_sims.append(boosted_score)
-            self.logger.debug(
-                "Label: %s | Raw: %.3f | Boost: %.3f | Boosted: %.3f",
-                label,
-                raw_score,
-                boost,
-                boosted_score,
-            )
+        # Both sides are unit length, so the dot product is the cosine similarity. Matching
+        # the matrix dtype keeps this a single sgemv instead of upcasting the whole matrix.
+        vec = self.embedder.encode(
+            [text[:_MAX_EMBED_CHARS]], convert_to_numpy=True, normalize_embeddings=True
+        )[0]
+        sims = self.doc_vectors @ vec.astype(self.doc_vectors.dtype, copy=False)
 
-        best_index = int(np.argmax(boosted_sims))
+        # Apply boosts without clamping
+        boosts = self.boosts.boost_vector(self.labels, text)
+        boosted_sims = sims + boosts
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for label, raw_score, boost, boosted_score in zip(
+                self.labels, sims, boosts, boosted_sims
+            ):
+                self.logger.debug(
+                    "Label: %s | Raw: %.3f | Boost: %.3f | Boosted: %.3f",
+                    label,
+                    raw_score,
+                    boost,
+                    boosted_score,
+                )
+
+        best_index = int(boosted_sims.argmax())
         predicted_label = self.labels[best_index]
-        raw_confidence = boosted_sims[best_index]
-        confidence = min(raw_confidence, 1.0)
+        confidence = min(float(boosted_sims[best_index]), 1.0)
         success = confidence >= confidence_threshold
 
         classification = Classification(
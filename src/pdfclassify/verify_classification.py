@@ -15,9 +15,11 @@ Features:
 """
 
 import argparse
-import json
+import math
+import os
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 import fitz  # PyMuPDF
@@ -35,8 +37,13 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from pdfclassify._json_io import JSONDecodeError, json_dumps, json_loads
+
 ACTIONS_STACK = []
 
+# Render scales are rounded up to this step so small resizes reuse cached pages
+SCALE_STEP = 0.25
+
 # ========= Keyboard Shortcuts Help =========
 SHORTCUTS = """
 Keyboard Shortcuts:
@@ -72,7 +79,8 @@ class PDFReviewer(QWidget):
         self.current_page = 0
         self.doc = None
         self.rendered_pixmap = None
-        self._image_buffer = None
+        # Rendered pages of the current file, keyed by (file index, page, scale)
+        self._render_page = lru_cache(maxsize=16)(self._render_page_raw)
 
         self.setFocusPolicy(Qt.StrongFocus)
         self.setWindowTitle("PDF Classification Verifier")
@@ -157,8 +165,8 @@ class PDFReviewer(QWidget):
         sidecar = pdf_path.with_name(f"{pdf_path.name}.meta.json")
         if sidecar.exists():
             try:
-                return "review_status" in json.loads(sidecar.read_text())
-            except json.JSONDecodeError:
+                return "review_status" in json_loads(sidecar.read_bytes())
+            except JSONDecodeError:
                 return False
         return False
 
@@ -171,6 +179,9 @@ class PDFReviewer(QWidget):
             self.pdf_label.clear()
             return
         pdf_path = self.get_current_pdf()
+        if self.doc is not None:
+            self.doc.close()
+        self._render_page.cache_clear()
         self.doc = fitz.open(pdf_path)
         self.current_page = 0
         self.render_current_page()
@@ -178,28 +189,55 @@ class PDFReviewer(QWidget):
 
     def render_current_page(self):
         """Render the current PDF page into an image for display."""
-        page = self.doc[self.current_page]
-        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-        self._image_buffer = bytes(pix.samples)
-        fmt = QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
-        img = QImage(self._image_buffer, pix.width, pix.height, pix.stride, fmt).copy()
-        self.rendered_pixmap = QPixmap.fromImage(img)
+        page_width = self.doc[self.current_page].rect.width
+        # Render just wide enough for the viewport's physical pixels, so Retina screens
+        # stay sharp, instead of a fixed 2x zoom
+        ratio = self.devicePixelRatioF()
+        target_width = self.scroll_area.viewport().width() * ratio
+        scale = target_width / page_width if page_width else 1.0
+        scale = max(SCALE_STEP, math.ceil(scale / SCALE_STEP) * SCALE_STEP)
+        self.rendered_pixmap = self._render_page(self.current_index, self.current_page, scale)
+        self.rendered_pixmap.setDevicePixelRatio(ratio)
         self.update_displayed_image()
         self.update_status_bar()
 
+    def _render_page_raw(self, index: int, page_no: int, scale: float) -> QPixmap:
+        """
+        Rasterize one page of the open document.
+
+        Args:
+            index (int): File index; only part of the cache key.
+            page_no (int): Zero-based page number.
+            scale (float): Zoom factor relative to 72 DPI.
+
+        Returns:
+            QPixmap: The rendered page.
+        """
+        _ = index  # distinguishes files in the render cache
+        pix = self.doc[page_no].get_pixmap(matrix=fitz.Matrix(scale, scale))
+        fmt = QImage.Format_RGBA8888 if pix.alpha else QImage.Format_RGB888
+        # The QImage only borrows pix's samples; fromImage copies them before pix is freed
+        img = QImage(pix.samples_mv, pix.width, pix.height, pix.stride, fmt)
+        return QPixmap.fromImage(img)
+
     def update_displayed_image(self):
         """Update the displayed image with scaling to fit the viewport width."""
         if self.rendered_pixmap:
+            ratio = self.devicePixelRatioF()
             scaled = self.rendered_pixmap.scaledToWidth(
-                self.scroll_area.viewport().width(), Qt.SmoothTransformation
+                round(self.scroll_area.viewport().width() * ratio), Qt.SmoothTransformation
             )
+            scaled.setDevicePixelRatio(ratio)
             self.pdf_label.setPixmap(scaled)
             self.pdf_label.adjustSize()
 
     def resizeEvent(self, event):
         """Handle window resize events to rescale the PDF display."""
         super().resizeEvent(event)
-        self.update_displayed_image()
+        if self.doc is not None and self.current_index < len(self.pdf_files):
+            self.render_current_page()
+        else:
+            self.update_displayed_image()
 
     # ========= Navigation =========
     def next_page(self):
@@ -228,6 +266,19 @@ class PDFReviewer(QWidget):
         """Return the Path to the sidecar JSON of the current PDF."""
         return self.get_current_pdf().with_name(f"{self.get_current_pdf().name}.meta.json")
 
+    @staticmethod
+    def write_sidecar(sidecar, payload):
+        """
+        Replace the sidecar atomically, so readers never see a half-written file.
+
+        Args:
+            sidecar (Path): Path to the sidecar JSON file.
+            payload (bytes): Serialized sidecar content.
+        """
+        tmp_path = sidecar.with_suffix(".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, sidecar)
+
     def current_pdf_name(self):
         """Return the filename of the current PDF."""
         return self.get_current_pdf().name
@@ -238,8 +289,8 @@ class PDFReviewer(QWidget):
         s = self.get_sidecar()
         if s.exists():
             try:
-                return json.loads(s.read_text()).get("review_status")
-            except json.JSONDecodeError:
+                return json_loads(s.read_bytes()).get("review_status")
+            except JSONDecodeError:
                 return None
         return None
 
@@ -251,16 +302,16 @@ class PDFReviewer(QWidget):
             status (str): The new review status ('confirmed' or 'rejected').
         """
         sidecar = self.get_sidecar()
-        backup = sidecar.read_text() if sidecar.exists() else "{}"
+        backup = sidecar.read_bytes() if sidecar.exists() else b"{}"
         ACTIONS_STACK.append((self.current_index, backup))
 
         try:
-            data = json.loads(backup) if backup.strip() else {}
-        except json.JSONDecodeError:
+            data = json_loads(backup) if backup.strip() else {}
+        except JSONDecodeError:
             data = {}
 
         data["review_status"] = status
-        sidecar.write_text(json.dumps(data, indent=2))
+        self.write_sidecar(sidecar, json_dumps(data, indent=True))
 
     def set_status(self, status):
         """
@@ -280,7 +331,7 @@ class PDFReviewer(QWidget):
             return
         idx, backup = ACTIONS_STACK.pop()
         sidecar = self.pdf_files[idx].with_name(f"{self.pdf_files[idx].name}.meta.json")
-        sidecar.write_text(backup)
+        self.write_sidecar(sidecar, backup)
         self.current_index = idx
         self.load_current_pdf()
         self.status_line.setText(f"Undo applied to {self.current_pdf_name()}")
@@ -1,24 +1,74 @@
 """Unit tests for verifying the restore_original_state behavior in PdfProcess."""
 
+from importlib.metadata import version
+from io import BytesIO
 from pathlib import Path
 
 import pytest
 from pypdf import PdfWriter
 
+RESOURCES = Path(__file__).parent / "testresources"
 
-def create_blank_pdf(path: Path) -> None:
-    """Utility to create a blank PDF file."""
+
+@pytest.fixture(scope="session")
+def invoice_test_pdf() -> Path:
+    """Return the path to invoice_test.pdf."""
+    return RESOURCES / "invoice_test.pdf"
+
+
+@pytest.fixture(scope="session")
+def report_test_pdf() -> Path:
+    """Return the path to report_test.pdf."""
+    return RESOURCES / "report_test.pdf"
+
+
+@pytest.fixture(scope="session")
+def unknown_test_pdf() -> Path:
+    """Return the path to unknown_1.pdf."""
+    return RESOURCES / "unknown_1.pdf"
+
+
+@pytest.fixture(name="shared_tmp_root", scope="session")
+def shared_tmp_root_fixture(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory for read-only test artifacts shared by the whole session."""
+    return tmp_path_factory.mktemp("shared")
+
+
+@pytest.fixture(name="blank_pdf_bytes", scope="session")
+def blank_pdf_bytes_fixture() -> bytes:
+    """Serialize a blank one-page PDF in memory, once per test session."""
     writer = PdfWriter()
     writer.add_blank_page(width=72, height=72)
-    with open(path, "wb") as f:
-        writer.write(f)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(name="pkg_version", scope="session")
+def pkg_version_fixture() -> str:
+    """Look up the installed package version once per test session."""
+    return version("dml-pdfclassify")
+
+
+@pytest.fixture(name="text_pdf_bytes", scope="session")
+def text_pdf_bytes_fixture(tmp_path_factory: pytest.TempPathFactory) -> bytes:
+    """Render a one-page PDF with a line of text, once per test session."""
+    from fpdf import FPDF  # pylint: disable=import-outside-toplevel
+
+    pdf_path = tmp_path_factory.mktemp("text_pdf") / "text.pdf"
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.cell(200, 10, txt="Test PDF content", ln=True)
+    pdf.output(str(pdf_path))
+    return pdf_path.read_bytes()
 
 
 @pytest.fixture(name="valid_pdf_file")
-def valid_pdf_fixture(tmp_path: Path) -> Path:
+def valid_pdf_fixture(tmp_path: Path, blank_pdf_bytes: bytes) -> Path:
     """Return a valid PDF for metadata testing."""
     pdf_path = tmp_path / "blank.pdf"
-    create_blank_pdf(pdf_path)
+    pdf_path.write_bytes(blank_pdf_bytes)
     return pdf_path
 
 
@@ -29,3 +79,26 @@ def invalid_pdf_fixture(tmp_path: Path) -> Path:
     with open(invalid_path, "wb") as f:
         f.write(b"\x00\x00\x00\x01B")
     return invalid_path
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_embedding_cache(tmp_path_factory: pytest.TempPathFactory):
+    """Keep classifier caches under this session's temp root, so parallel workers never
+    share one and the user's real cache is left alone."""
+    cache_root = tmp_path_factory.mktemp("user_cache")
+    with pytest.MonkeyPatch.context() as patcher:
+        patcher.setattr(
+            "pdfclassify.pdf_semantic_classifier.user_cache_dir", lambda: str(cache_root)
+        )
+        yield cache_root
+
+
+@pytest.fixture(autouse=True)
+def fresh_classifier_cache():
+    """Drop classifiers memoized by pdf_process so mocks never leak between tests."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from pdfclassify import pdf_process
+
+    pdf_process._get_classifier.cache_clear()
+    yield
+    pdf_process._get_classifier.cache_clear()
@@ -1,6 +1,5 @@
 """Unit tests for the ArgumentHandler class in pdfclassify.argument_handler."""
 
-from importlib.metadata import version
 from pathlib import Path
 
 import pytest
@@ -56,6 +55,13 @@ def test_mutually_exclusive_flags_fail(capsys: pytest.CaptureFixture) -> None:
     print("\n" + captured.err)
 
 
+def test_multiple_input_files() -> None:
+    """Several input files are kept in order; input_file is the first of them."""
+    args = ArgumentHandler().parse_args_from(["a.pdf", "b.pdf"])
+    assert args.input_file == "a.pdf"
+    assert args.input_files == ("a.pdf", "b.pdf")
+
+
 def test_missing_input_file_raises(capsys: pytest.CaptureFixture) -> None:
     """Test that missing the required input_file argument raises SystemExit."""
     with pytest.raises(SystemExit):
@@ -82,9 +88,14 @@ def test_default_paths_are_set(monkeypatch) -> None:
     assert test_output in Path(args.output_path).parents or args.output_path == test_output
 
 
-def test_version_output(capsys: pytest.CaptureFixture) -> None:
+def test_parser_is_built_once() -> None:
+    """Every ArgumentHandler shares one argparse parser."""
+    assert ArgumentHandler().parser is ArgumentHandler().parser
+
+
+def test_version_output(capsys: pytest.CaptureFixture, pkg_version: str) -> None:
     """Test that the --version flag prints the expected package version and exits."""
-    expected_version = version("dml-pdfclassify")
+    expected_version = pkg_version
     with pytest.raises(SystemExit):
         ArgumentHandler().parse_args_from(["--version"])
     captured = capsys.readouterr()
@@ -46,3 +46,22 @@ def test_default_config_values(tmp_path: Path, monkeypatch: pytest.MonkeyPatch)
     assert isinstance(config.cache_dir, Path)
     assert isinstance(config.confidence_threshold, float)
     assert 0.0 <= config.confidence_threshold <= 1.0
+    assert config.embedding_backend == "torch"
+    assert config.embedding_model_file is None
+
+
+def test_embedding_backend_from_user_config(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The embedding backend and model file are read from [settings]."""
+    user_config = tmp_path / "pdfclassify.toml"
+    user_config.write_text(
+        '[settings]\nembedding_backend = "ONNX"\n'
+        'embedding_model_file = "onnx/model_qint8_avx512.onnx"\n',
+        encoding="utf-8",
+    )
+    monkeypatch.setattr("pdfclassify.config.PDFClassifyConfig.USER_CONFIG_PATH", user_config)
+
+    config = PDFClassifyConfig()
+    assert config.embedding_backend == "onnx"
+    assert config.embedding_model_file == "onnx/model_qint8_avx512.onnx"
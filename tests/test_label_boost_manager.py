@@ -4,10 +4,10 @@ Tests include config loading, boost scoring, missing label detection,
 and synchronization logic.
 """
 
+import hashlib
 import json
 import logging
-import tempfile
-from pathlib import Path
+import shutil
 from unittest.mock import patch
 
 import pytest
@@ -16,10 +16,9 @@ from pdfclassify.label_boost_manager import LabelBoostManager
 from pdfclassify.label_config import LabelConfig
 
 
-@pytest.fixture(name="temp_config_file")
-def fixture_temp_config_file(tmp_path):
-    """Create a temporary label_config_path for testing."""
-    config_path = tmp_path / "label_boosts.json"
+@pytest.fixture(name="temp_config_file", scope="module")
+def fixture_temp_config_file(shared_tmp_root):
+    """Write the pristine label_boosts.json once, named after its content."""
     config_data = {
         "invoice": {
             "boost_phrases": ["total", "invoice number"],
@@ -30,21 +29,26 @@ def fixture_temp_config_file(tmp_path):
             "minimum_parts": ["month", "year"],
         }
     }
-    config_path.write_text(json.dumps(config_data), encoding="utf-8")
+    payload = json.dumps(config_data).encode("utf-8")
+    digest = hashlib.sha256(payload).hexdigest()[:12]
+    config_path = shared_tmp_root / f"label_boosts_{digest}.json"
+    if not config_path.exists():
+        config_path.write_bytes(payload)
     return config_path
 
 
 @pytest.fixture(name="patched_config")
-def fixture_patched_config(temp_config_file):
-    """Mock CONFIG to point to the temp config file and fake training data dir."""
+def fixture_patched_config(temp_config_file, tmp_path):
+    """Mock CONFIG to point to a per-test copy of the config and a fake training data dir."""
+    # LabelBoostManager saves the config when it syncs labels, so each test gets a copy
+    config_path = tmp_path / temp_config_file.name
+    shutil.copy2(temp_config_file, config_path)
     with patch("pdfclassify.label_boost_manager.CONFIG") as mock:
-        mock.label_config_path = temp_config_file
-        with tempfile.TemporaryDirectory() as temp_dir:
-            mock.training_data_dir = Path(temp_dir)  # ← FIXED HERE
-            training_path = mock.training_data_dir
-            (training_path / "invoice").mkdir()
-            (training_path / "receipt").mkdir()
-            yield mock
+        mock.label_config_path = config_path
+        mock.training_data_dir = tmp_path / "training"
+        (mock.training_data_dir / "invoice").mkdir(parents=True)
+        (mock.training_data_dir / "receipt").mkdir()
+        yield mock
 
 
 def test_load_config(patched_config):  # pylint: disable=unused-argument
@@ -71,6 +75,16 @@ def test_boost_score_nomatch(patched_config):  # pylint: disable=unused-argument
     assert score == 0.0
 
 
+def test_boost_vector_aligned_with_labels(patched_config):  # pylint: disable=unused-argument
+    """Test that boost_vector scores each distinct label once, in label order."""
+    manager = LabelBoostManager()
+    labels = ["invoice", "receipt", "invoice", "invoice"]
+    with patch.object(manager, "boost_score", wraps=manager.boost_score) as spy:
+        boosts = manager.boost_vector(labels, "Invoice Number: 123")
+    assert boosts.tolist() == [0.06, 0.0, 0.06, 0.06]
+    assert spy.call_count == 2
+
+
 def test_missing_labels_detection(patched_config):  # pylint: disable=unused-argument
     """Test detection of training labels not yet in config."""
     with patch.object(LabelBoostManager, "sync_with_training_labels"):
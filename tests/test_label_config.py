@@ -42,6 +42,17 @@ def test_matches_and_boost():
     assert config.get_boost_if_matched("receipt enclosed") == 0.0
 
 
+def test_phrase_matching_is_literal_and_follows_edits():
+    """Phrases match case-insensitively as literal text, and edits take effect."""
+    config = LabelConfig.from_dict({"boost_phrases": ["a.b (ltd)"], "boost": 0.05})
+    assert config.matches_phrase("From A.B (LTD) today")
+    assert not config.matches_phrase("From axb (ltd) today")
+    config.boost_phrases = ["receipt"]
+    assert config.matches_phrase("Receipt enclosed")
+    config.boost_phrases = []
+    assert not config.matches_phrase("Receipt enclosed")
+
+
 def test_is_complete():
     """Test completeness check for empty and valid configurations."""
     incomplete = LabelConfig.from_dict({})
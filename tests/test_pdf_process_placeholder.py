@@ -1,5 +1,5 @@
 # tests/test_pdf_process_placeholder.py
-# pylint: disable=redefined-outer-name
+# pylint: disable=redefined-outer-name, protected-access
 
 """Tests for placeholder-skipping and 2OCR queue logic in PdfProcess."""
 
@@ -29,17 +29,27 @@ def save_meta_invocations(monkeypatch):
     return calls
 
 
+@pytest.fixture(autouse=True)
+def no_subprocess(monkeypatch):
+    """Fail any test that shells out; xattrs are read through os or libc only."""
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("placeholder detection should not spawn a process")
+
+    monkeypatch.setattr(subprocess, "check_output", fail)
+    monkeypatch.setattr(subprocess, "run", fail)
+
+
 def test_skip_zero_length_placeholder(tmp_path, monkeypatch, save_meta_invocations):
     """
     GIVEN a zero-length file with the placeholder xattr
     WHEN PdfProcess is instantiated
-    THEN it raises MyException and does not save metadata.
+    THEN it raises MyException without spawning a process and does not save metadata.
     """
     pdf = tmp_path / "stub.pdf"
     pdf.write_bytes(b"")
 
     monkeypatch.setattr(os, "listxattr", lambda _: ["com.apple.placeholder"], raising=False)
-    monkeypatch.setattr(subprocess, "check_output", lambda *args, **kwargs: b"", raising=False)
 
     with pytest.raises(MyException):
         PdfProcess(str(pdf))
@@ -47,6 +57,24 @@ def test_skip_zero_length_placeholder(tmp_path, monkeypatch, save_meta_invocatio
     assert save_meta_invocations["count"] == 0
 
 
+def test_non_empty_file_skips_xattr_lookup(tmp_path, monkeypatch, save_meta_invocations):
+    """
+    GIVEN a non-empty PDF
+    WHEN PdfProcess is instantiated
+    THEN extended attributes are never queried.
+    """
+    pdf = tmp_path / "real.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n%%EOF")
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("xattrs should not be listed for non-empty files")
+
+    monkeypatch.setattr(os, "listxattr", fail, raising=False)
+
+    PdfProcess(str(pdf))
+    assert save_meta_invocations["count"] == 1
+
+
 def test_predict_empty_text_queues_for_2ocr(tmp_path, monkeypatch):
     """
     GIVEN a non-placeholder PDF and a classifier that raises empty-text
@@ -106,3 +134,31 @@ def test_predict_empty_text_queues_for_2ocr(tmp_path, monkeypatch):
     assert len(moved) == 1, "One file should be queued for OCR"
     assert moved[0].name.startswith("empty"), "Queued file name should match original"
     assert not pdf.exists(), "Original file should be moved out"
+
+
+def test_next_free_skips_existing_names(tmp_path):
+    """The first unused stem_N.pdf is chosen after a single directory scan."""
+    for name in ("doc.pdf", "doc_1.pdf", "doc_3.pdf"):
+        (tmp_path / name).write_bytes(b"")
+    assert pp_mod._next_free(tmp_path, "doc") == tmp_path / "doc_2.pdf"
+    assert pp_mod._next_free(tmp_path, "other") == tmp_path / "other.pdf"
+
+
+def test_libc_listxattr_matches_os(tmp_path):
+    """The ctypes fallback reports the same attribute names as os.listxattr."""
+    if not hasattr(os, "setxattr"):
+        pytest.skip("os.setxattr not available on this platform")
+    target = tmp_path / "attrs.pdf"
+    target.write_bytes(b"")
+    try:
+        os.setxattr(target, "user.pdfclassify", b"1")
+    except OSError:
+        pytest.skip("filesystem does not support user xattrs")
+    assert pp_mod._libc_listxattr(target) == os.listxattr(target)
+
+
+def test_next_free_reserves_the_name(tmp_path):
+    """A returned name is claimed on disk, so a second caller gets the next one."""
+    first = pp_mod._next_free(tmp_path, "doc")
+    assert first.exists()
+    assert pp_mod._next_free(tmp_path, "doc") == tmp_path / "doc_1.pdf"
@@ -5,21 +5,17 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
-from fpdf import FPDF
 
 from pdfclassify.argument_handler import ParsedArgs
+from pdfclassify.pdf_metadata_manager import PDFMetadataManager
 from pdfclassify.pdf_process import PdfProcess
 
 
 @pytest.fixture
-def temp_pdf(tmp_path: Path) -> Path:
+def temp_pdf(tmp_path: Path, text_pdf_bytes: bytes) -> Path:
     """Create a dummy PDF file."""
     pdf_path = tmp_path / "mocked_test.pdf"
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt="Test PDF content", ln=True)
-    pdf.output(str(pdf_path))
+    pdf_path.write_bytes(text_pdf_bytes)
     return pdf_path
 
 
@@ -37,38 +33,159 @@ def parsed_args(tmp_path: Path) -> ParsedArgs:
     )
 
 
+@pytest.fixture
+def mock_result(request: pytest.FixtureRequest):
+    """Classification stand-in; indirect parametrization supplies (success, label, confidence)."""
+    success, label, confidence = getattr(request, "param", (True, "invoice", 0.92))
+    return type("MockResult", (), {"success": success, "label": label, "confidence": confidence})()
+
+
+@pytest.mark.parametrize(
+    "mock_result, destination, pattern",
+    [
+        ((True, "invoice", 0.92), "output", "invoice*.pdf"),
+        ((False, "unknown", 0.2), "rejects", "mocked_test*.pdf"),
+    ],
+    ids=["success", "failure"],
+    indirect=["mock_result"],
+)
 @patch("pdfclassify.pdf_process.PDFSemanticClassifier")
-def test_predict_success_with_mock(mock_classifier_class, temp_pdf, parsed_args):
-    """Mock classifier returns successful prediction, file should be moved/renamed."""
+def test_predict_with_mock(
+    mock_classifier_class, temp_pdf, parsed_args, mock_result, destination, pattern
+):  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    """A successful prediction is renamed into the output directory, a failed one is
+    moved to pdfclassify.rejects under its original name."""
     mock_classifier = MagicMock()
     mock_classifier.train.return_value = None
-    mock_classifier.predict.return_value = type(
-        "MockResult", (), {"success": True, "label": "invoice", "confidence": 0.92}
-    )()
+    mock_classifier.predict.return_value = mock_result
 
     mock_classifier_class.return_value = mock_classifier
 
     process = PdfProcess(str(temp_pdf))
     process.predict(parsed_args)
 
-    moved_files = list(Path(parsed_args.output_path).glob("invoice*.pdf"))
-    assert moved_files, "Expected a renamed 'invoice*.pdf' file in the output directory."
+    target_dir = (
+        Path(parsed_args.output_path)
+        if destination == "output"
+        else temp_pdf.parent / "pdfclassify.rejects"
+    )
+    moved_files = list(target_dir.glob(pattern))
+    assert moved_files, f"Expected a '{pattern}' file in {target_dir}."
 
 
-@patch("pdfclassify.pdf_process.PDFSemanticClassifier")
-def test_predict_failure_with_mock(mock_classifier_class, temp_pdf, parsed_args):
-    """Mock classifier returns failed prediction, file should be moved to rejects."""
-    mock_classifier = MagicMock()
-    mock_classifier.train.return_value = None
-    mock_classifier.predict.return_value = type(
-        "MockResult", (), {"success": False, "label": "unknown", "confidence": 0.2}
+def test_process_many_reports_errors(tmp_path, parsed_args, monkeypatch):
+    """Files that cannot be processed are reported instead of aborting the batch."""
+    # pylint: disable=import-outside-toplevel
+    from pdfclassify import pdf_process
+
+    monkeypatch.setattr(pdf_process, "_get_classifier", lambda _data_dir: None)
+    missing = [tmp_path / "missing_1.pdf", tmp_path / "missing_2.pdf"]
+    errors = PdfProcess.process_many(missing, parsed_args)
+    assert len(errors) == 2
+    assert all("does not exist" in message for message in errors)
+
+
+@pytest.mark.parametrize("error", [ValueError("no text"), RuntimeError("empty model")])
+def test_process_one_reports_classifier_errors(temp_pdf, parsed_args, monkeypatch, error):
+    """Classifier failures become per-file messages instead of aborting the pool."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from pdfclassify import pdf_process
+
+    def fail(*_args):
+        raise error
+
+    monkeypatch.setattr(PdfProcess, "predict", fail)
+    assert pdf_process._process_one(str(temp_pdf), parsed_args) == f"{temp_pdf}: {error}"
+
+
+def test_process_many_keeps_same_named_results(tmp_path, parsed_args, text_pdf_bytes, monkeypatch):
+    """Two PDFs heading for the same label and stem both survive a parallel batch."""
+    # pylint: disable=import-outside-toplevel
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pdfclassify import pdf_process
+
+    paths = []
+    for name in ("first.pdf", "second.pdf"):
+        (tmp_path / name).write_bytes(text_pdf_bytes + name.encode())
+        paths.append(tmp_path / name)
+
+    classifier = MagicMock()
+    classifier.predict.return_value = type(
+        "MockResult", (), {"success": True, "label": "invoice", "confidence": 0.92}
     )()
+    monkeypatch.setattr(pdf_process, "_get_classifier", lambda _data_dir: classifier)
+    monkeypatch.setattr(pdf_process, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(pdf_process.os, "cpu_count", lambda: 2)
 
-    mock_classifier_class.return_value = mock_classifier
+    # Let both workers choose their destination before either one moves its file
+    both_named = threading.Barrier(2, timeout=10)
+    rename = PDFMetadataManager.rename_with_sidecar
 
-    process = PdfProcess(str(temp_pdf))
-    process.predict(parsed_args)
+    def rename_after_both_named(self, new_name):
+        both_named.wait()
+        return rename(self, new_name)
+
+    monkeypatch.setattr(PDFMetadataManager, "rename_with_sidecar", rename_after_both_named)
+    assert not PdfProcess.process_many(paths, parsed_args)
+
+    moved = sorted(Path(parsed_args.output_path).glob("*.pdf"))
+    assert len(moved) == 2
+    assert {p.read_bytes() for p in moved} == {
+        text_pdf_bytes + b"first.pdf",
+        text_pdf_bytes + b"second.pdf",
+    }
+    assert all(p.with_name(p.name + ".meta.json").exists() for p in moved)
+
+
+def test_worker_initializer_caps_torch_threads(monkeypatch):
+    """Pool workers split the cores and load the classifier from its training folder."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from pdfclassify import pdf_process
+
+    calls = []
+    monkeypatch.setattr("pdfclassify.pdf_semantic_classifier.torch.set_num_threads", calls.append)
+    monkeypatch.setattr(pdf_process, "_get_classifier", lambda data_dir: f"classifier:{data_dir}")
+    monkeypatch.setattr(pdf_process, "_worker_classifier", None)
+    pdf_process._set_classifier("training", 2)
+    assert pdf_process._worker_classifier == "classifier:training"
+    assert calls == [2]
+
+
+@patch("pdfclassify.pdf_process.PDFSemanticClassifier")
+@pytest.mark.parametrize("mock_result", [(False, "unknown", 0.2)], indirect=True)
+def test_predict_reuses_supplied_classifier(
+    mock_classifier_class, temp_pdf, parsed_args, mock_result
+):
+    """A pre-trained classifier is used as-is instead of building a new one."""
+    classifier = MagicMock()
+    classifier.predict.return_value = mock_result
+
+    PdfProcess(str(temp_pdf)).predict(parsed_args, classifier)
+
+    mock_classifier_class.assert_not_called()
+    classifier.train.assert_not_called()
+    classifier.predict.assert_called_once()
+
+
+def test_metadata_manager_built_once(temp_pdf, parsed_args, mock_result):
+    """Saving metadata, predicting and renaming share a single PDFMetadataManager."""
+    classifier = MagicMock()
+    classifier.predict.return_value = mock_result
 
-    rejects_dir = temp_pdf.parent / "pdfclassify.rejects"
-    moved_files = list(rejects_dir.glob("mocked_test*.pdf"))
-    assert moved_files, "Expected file moved to pdfclassify.rejects with original name."
+    with patch(
+        "pdfclassify.pdf_process.PDFMetadataManager", wraps=PDFMetadataManager
+    ) as manager_class:
+        PdfProcess(str(temp_pdf)).predict(parsed_args, classifier)
+
+    assert manager_class.call_count == 1
+
+
+@patch("pdfclassify.pdf_process.PDFSemanticClassifier")
+def test_classifier_built_once_per_training_dir(mock_classifier_class, parsed_args):
+    """Repeated calls for the same training folder reuse one classifier."""
+    first = PdfProcess.train_classifier(parsed_args)
+    second = PdfProcess.train_classifier(parsed_args)
+    assert first is second
+    mock_classifier_class.assert_called_once_with(data_dir=parsed_args.training_data_path)
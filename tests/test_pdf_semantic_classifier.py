@@ -2,17 +2,20 @@
 
 # pylint: disable=redefined-outer-name
 
+import hashlib
 import json
 import logging
+import os
 import shutil
-import time
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from pdfclassify.pdf_semantic_classifier import Classification, PDFSemanticClassifier
 
 APP_NAME = "pdfclassify"
+TRAINING_SOURCE = Path(__file__).parent / "testresources" / "labeled_training_data"
 
 
 def create_blank_pdf(path: Path) -> None:
@@ -21,6 +24,12 @@ def create_blank_pdf(path: Path) -> None:
     path.write_bytes(b"%PDF-1.4\n1 0 obj<<>>endobj\ntrailer<>\n%%EOF")
 
 
+def indexed_paths(classifier: PDFSemanticClassifier) -> list[str]:
+    """Return the training PDF paths recorded in the embedding row index."""
+    with open(classifier.index_path, encoding="utf-8") as f:
+        return json.load(f)["paths"]
+
+
 @pytest.fixture(autouse=True)
 def patch_logger_for_caplog(caplog):  # pylint: disable=unused-argument
     """Ensure the application logger outputs to stderr so caplog can capture it cleanly."""
@@ -35,42 +44,71 @@ def patch_logger_for_caplog(caplog):  # pylint: disable=unused-argument
 @pytest.fixture
 def labeled_training_copy(tmp_path: Path) -> Path:
     """Copy labeled training data to a temporary directory."""
-    source = Path(__file__).parent / "testresources" / "labeled_training_data"
-    if not source.exists():
+    if not TRAINING_SOURCE.exists():
         pytest.skip("Labeled training data directory not found.")
     dest = tmp_path / "training_data"
-    shutil.copytree(source, dest)
+    shutil.copytree(TRAINING_SOURCE, dest)
     return dest
 
 
-@pytest.fixture
-def classifier(labeled_training_copy: Path) -> PDFSemanticClassifier:
-    """Return a classifier initialized with the copied training data."""
-    return PDFSemanticClassifier(data_dir=str(labeled_training_copy))
+@pytest.fixture(scope="session")
+def training_pdfs() -> tuple[Path, ...]:
+    """List the training PDFs once, relative to the training data root."""
+    return tuple(sorted(p.relative_to(TRAINING_SOURCE) for p in TRAINING_SOURCE.rglob("*.pdf")))
 
 
-@pytest.fixture
-def empty_data_dir(tmp_path: Path) -> Path:
-    """Provide an empty directory for testing no-data behavior."""
-    return tmp_path / "empty_data"
+class HashEmbedder:  # pylint: disable=too-few-public-methods
+    """Deterministic stand-in for the sentence-transformer in cache lifecycle tests."""
+
+    dimension = 32
+
+    def encode(self, texts, normalize_embeddings: bool = False, **_kwargs) -> np.ndarray:
+        """Return one pseudo-random vector per text, seeded from the text's digest."""
+        vectors = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest())
+            vectors[row] = np.random.default_rng(seed).standard_normal(self.dimension)
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
 
 
 @pytest.fixture
-def invoice_test_pdf() -> Path:
-    """Return the path to invoice_test.pdf."""
-    return Path(__file__).parent / "testresources" / "invoice_test.pdf"
+def fake_embedder(monkeypatch: pytest.MonkeyPatch) -> HashEmbedder:
+    """Skip loading the model for tests about caching rather than semantics."""
+    embedder = HashEmbedder()
+    monkeypatch.setattr(
+        "pdfclassify.pdf_semantic_classifier._get_embedder", lambda *_args, **_kwargs: embedder
+    )
+    return embedder
 
 
 @pytest.fixture
-def report_test_pdf() -> Path:
-    """Return the path to report_test.pdf."""
-    return Path(__file__).parent / "testresources" / "report_test.pdf"
+def classifier(
+    labeled_training_copy: Path, fake_embedder: HashEmbedder  # pylint: disable=unused-argument
+) -> PDFSemanticClassifier:
+    """Return a classifier over the copied training data, embedded by the hash stand-in."""
+    return PDFSemanticClassifier(
+        data_dir=str(labeled_training_copy), cache_name=labeled_training_copy.name
+    )
+
+
+@pytest.fixture(scope="session")
+def trained_classifier(tmp_path_factory: pytest.TempPathFactory) -> PDFSemanticClassifier:
+    """Train once per session on a shared copy, for tests that only predict."""
+    if not TRAINING_SOURCE.exists():
+        pytest.skip("Labeled training data directory not found.")
+    dest = tmp_path_factory.mktemp("shared_train") / "training_data"
+    shutil.copytree(TRAINING_SOURCE, dest)
+    shared = PDFSemanticClassifier(data_dir=str(dest), cache_name="shared_training_data")
+    shared.train()
+    return shared
 
 
 @pytest.fixture
-def unknown_test_pdf() -> Path:
-    """Return the path to unknown_1.pdf."""
-    return Path(__file__).parent / "testresources" / "unknown_1.pdf"
+def empty_data_dir(tmp_path: Path) -> Path:
+    """Provide an empty directory for testing no-data behavior."""
+    return tmp_path / "empty_data"
 
 
 @pytest.fixture
@@ -90,27 +128,28 @@ def blank_pdf(tmp_path: Path) -> Path:
 
 
 def test_train_and_predict_invoice(
-    classifier: PDFSemanticClassifier, invoice_test_pdf: Path
+    trained_classifier: PDFSemanticClassifier, invoice_test_pdf: Path
 ) -> None:
     """Train and classify a known invoice document."""
-    classifier.train()
-    result = classifier.predict(str(invoice_test_pdf), confidence_threshold=0.1)
+    result = trained_classifier.predict(str(invoice_test_pdf), confidence_threshold=0.1)
     assert result.success
     assert result.label == "invoice"
 
 
-def test_train_and_predict_report(classifier: PDFSemanticClassifier, report_test_pdf: Path) -> None:
+def test_train_and_predict_report(
+    trained_classifier: PDFSemanticClassifier, report_test_pdf: Path
+) -> None:
     """Train and classify a known report document."""
-    classifier.train()
-    result = classifier.predict(str(report_test_pdf), confidence_threshold=0.1)
+    result = trained_classifier.predict(str(report_test_pdf), confidence_threshold=0.1)
     assert result.success
     assert result.label == "report"
 
 
-def test_predict_unknown_fails(classifier: PDFSemanticClassifier, unknown_test_pdf: Path) -> None:
+def test_predict_unknown_fails(
+    trained_classifier: PDFSemanticClassifier, unknown_test_pdf: Path
+) -> None:
     """Test that an unknown document fails classification."""
-    classifier.train()
-    result = classifier.predict(str(unknown_test_pdf), confidence_threshold=0.95)
+    result = trained_classifier.predict(str(unknown_test_pdf), confidence_threshold=0.95)
     assert isinstance(result, Classification)
     assert not result.success
 
@@ -126,8 +165,10 @@ def test_embedding_updated_on_file_change(
     with open(hash_path, encoding="utf-8") as f:
         before = json.load(f)
 
-    time.sleep(1)
+    # Move the mtime forward explicitly instead of sleeping past the clock granularity
+    later = invoice_file.stat().st_mtime + 5
     invoice_file.write_text("Modified invoice text.", encoding="utf-8")
+    os.utime(invoice_file, (later, later))
 
     classifier.train()
     with open(hash_path, encoding="utf-8") as f:
@@ -142,70 +183,319 @@ def test_embedding_removed_on_file_delete(
     """Ensure deleted PDFs remove their embeddings."""
     classifier.train()
     invoice_file = next((labeled_training_copy / "invoice").glob("*.pdf"))
-    embed_path = classifier._embedding_path(str(invoice_file))  # pylint: disable=protected-access
-    assert embed_path.exists()
+    assert str(invoice_file) in indexed_paths(classifier)
 
     invoice_file.unlink()
     caplog.clear()
     with caplog.at_level("INFO"):
         classifier.train()
 
-    # embedding file should be gone
-    assert not embed_path.exists()
+    # embedding row should be gone
+    assert any("removed embedding" in msg.lower() for msg in caplog.messages)
+    assert str(invoice_file) not in indexed_paths(classifier)
+    assert np.load(classifier.model_path).shape[0] == len(indexed_paths(classifier))
 
 
 def test_cache_reuse_skips_unnecessary_retraining(
-    classifier: PDFSemanticClassifier, caplog: pytest.LogCaptureFixture
+    trained_classifier: PDFSemanticClassifier, caplog: pytest.LogCaptureFixture
 ) -> None:
     """Ensure cache prevents redundant retraining."""
-    classifier.train()
     caplog.clear()
     with caplog.at_level("INFO"):
-        classifier.train()
+        trained_classifier.train()
     assert not any("updated embedding" in msg.lower() for msg in caplog.messages)
 
 
-def test_empty_pdf_raises(classifier: PDFSemanticClassifier, blank_pdf: Path) -> None:
+def test_empty_pdf_raises(trained_classifier: PDFSemanticClassifier, blank_pdf: Path) -> None:
     """An empty (blank) PDF should raise a ValueError for empty text or extraction failure."""
-    classifier.train()
     with pytest.raises(ValueError):
-        classifier.predict(str(blank_pdf))
+        trained_classifier.predict(str(blank_pdf))
 
 
+@pytest.mark.usefixtures("fake_embedder")
 def test_cache_corrupt_json_recovery(
-    labeled_training_copy: Path, caplog: pytest.LogCaptureFixture
+    labeled_training_copy: Path, training_pdfs: tuple[Path, ...], caplog: pytest.LogCaptureFixture
 ) -> None:
-    """A corrupt file_hashes.json should be ignored and re-embedding occur."""
+    """A corrupt file_stats.json should be ignored and re-embedding occur."""
     classifier = PDFSemanticClassifier(
         data_dir=str(labeled_training_copy), cache_name=labeled_training_copy.name
     )
-    classifier.train()
+    pdfs = [labeled_training_copy / rel for rel in training_pdfs]
+    # Seed the cache with placeholder rows rather than running a first train
+    classifier._save_rows(  # pylint: disable=protected-access
+        np.zeros((len(pdfs), HashEmbedder.dimension), dtype=np.float32),
+        [str(p) for p in pdfs],
+        [p.parent.name for p in pdfs],
+    )
     with open(classifier.hash_path, "w", encoding="utf-8") as f:
         f.write("{ not valid json }")
     caplog.clear()
     with caplog.at_level("INFO"):  # capture both warnings and info for re-embedding logs
         classifier.train()
 
-    # after corrupt JSON, embeddings directory should have been rebuilt
-    embeddings = list(Path(classifier.embeddings_dir).glob("*.joblib"))
-    pdfs = list(Path(labeled_training_copy).rglob("*.pdf"))
-    assert len(embeddings) == len(pdfs)
+    # after corrupt JSON, every placeholder row should have been re-embedded
+    embeddings = np.load(classifier.model_path)
+    assert embeddings.shape[0] == len(pdfs)
+    assert np.allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-5)
 
 
-def test_embedding_files_exist_after_train(labeled_training_copy: Path) -> None:
-    """After a successful train, each PDF should have a .joblib embedding in a fresh cache."""
+@pytest.mark.usefixtures("fake_embedder")
+def test_embedding_files_exist_after_train(
+    labeled_training_copy: Path, training_pdfs: tuple[Path, ...]
+) -> None:
+    """After a successful train, each PDF should have an embedding row in a fresh cache."""
     classifier = PDFSemanticClassifier(
         data_dir=str(labeled_training_copy), cache_name=labeled_training_copy.name
     )
     classifier.train()
-    embeddings = list(Path(classifier.embeddings_dir).glob("*.joblib"))
-    pdfs = list(labeled_training_copy.rglob("*.pdf"))
-    assert len(embeddings) == len(pdfs)
+    embeddings = np.load(classifier.model_path, mmap_mode="r")
+    assert embeddings.shape[0] == len(training_pdfs)
+    assert embeddings.dtype == np.float32
+    assert sorted(indexed_paths(classifier)) == sorted(
+        str(labeled_training_copy / rel) for rel in training_pdfs
+    )
 
 
-def test_threshold_boundary(classifier: PDFSemanticClassifier, invoice_test_pdf: Path) -> None:
+def test_threshold_boundary(
+    trained_classifier: PDFSemanticClassifier, invoice_test_pdf: Path
+) -> None:
     """When the similarity equals the threshold, success should be True."""
-    classifier.train()
-    result = classifier.predict(str(invoice_test_pdf), confidence_threshold=0.0)
+    result = trained_classifier.predict(str(invoice_test_pdf), confidence_threshold=0.0)
     assert result.success
     assert result.label == "invoice"
+
+
+def test_embedder_shared_between_instances(labeled_training_copy: Path) -> None:
+    """Constructing a second classifier reuses the already-loaded embedding model."""
+    first = PDFSemanticClassifier(data_dir=str(labeled_training_copy))
+    second = PDFSemanticClassifier(data_dir=str(labeled_training_copy))
+    assert first.embedder is second.embedder
+
+
+@pytest.mark.parametrize("backend", ["onnx", "openvino"])
+def test_exported_backends_receive_configured_device(
+    monkeypatch: pytest.MonkeyPatch, backend: str
+) -> None:
+    """Non-torch backends are loaded on the configured device rather than the default."""
+    # pylint: disable=import-outside-toplevel
+    from pdfclassify.pdf_semantic_classifier import _get_embedder
+
+    calls = []
+    monkeypatch.setattr(
+        "pdfclassify.pdf_semantic_classifier.SentenceTransformer",
+        lambda *args, **kwargs: calls.append((args, kwargs)),
+    )
+    _get_embedder.__wrapped__("some-model", "cuda", backend)
+    assert calls[0][1]["device"] == "cuda"
+    assert calls[0][1]["backend"] == backend
+
+
+def test_doc_vectors_unit_normalized_after_train(
+    trained_classifier: PDFSemanticClassifier,
+) -> None:
+    """Training stores unit-length vectors so predict needs no per-call normalization."""
+    norms = np.linalg.norm(trained_classifier.doc_vectors, axis=1)
+    assert np.allclose(norms, 1.0, atol=1e-5)
+
+
+@pytest.mark.usefixtures("fake_embedder")
+def test_parallel_extraction_embeds_every_file(
+    labeled_training_copy: Path, training_pdfs: tuple[Path, ...], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The process-pool extraction path produces the same embeddings as the serial one."""
+    monkeypatch.setattr(
+        "pdfclassify.pdf_semantic_classifier._PARALLEL_EXTRACT_THRESHOLD", 1, raising=True
+    )
+    classifier = PDFSemanticClassifier(
+        data_dir=str(labeled_training_copy), cache_name=f"{labeled_training_copy.name}_parallel"
+    )
+    classifier.train()
+    assert len(classifier.labels) == len(training_pdfs)
+
+
+def test_unchanged_files_not_rehashed(
+    trained_classifier: PDFSemanticClassifier, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A second train with unchanged size and mtime reuses the stored fingerprints."""
+
+    def fail(*_args) -> str:
+        raise AssertionError("unchanged file was re-hashed")
+
+    monkeypatch.setattr(trained_classifier, "_compute_file_hash", fail)
+    trained_classifier.train()
+
+
+@pytest.mark.usefixtures("fake_embedder")
+def test_training_never_reads_file_contents_for_fingerprints(
+    labeled_training_copy: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Fingerprints come from size and mtime unless PDFCLASSIFY_FORCE_HASH=1."""
+
+    def fail(*_args):
+        raise AssertionError("file contents were hashed")
+
+    monkeypatch.setattr("pdfclassify.pdf_semantic_classifier.hashlib.file_digest", fail)
+    classifier = PDFSemanticClassifier(
+        data_dir=str(labeled_training_copy), cache_name=labeled_training_copy.name
+    )
+    classifier.hash_path.unlink(missing_ok=True)
+    classifier.train()
+    entries = json.loads(classifier.hash_path.read_text(encoding="utf-8"))
+    assert all(entry["fp"] == f"{entry['size']}:{entry['mtime_ns']}" for entry in entries.values())
+
+    monkeypatch.setenv("PDFCLASSIFY_FORCE_HASH", "1")
+    with pytest.raises(AssertionError, match="hashed"):
+        classifier.train()
+
+
+def test_legacy_hash_file_is_migrated(
+    classifier: PDFSemanticClassifier, training_pdfs: tuple[Path, ...]
+) -> None:
+    """Stat entries from file_hashes.json are reused once, then the old file is removed."""
+    classifier.train()
+    os.replace(classifier.hash_path, classifier.legacy_hash_path)
+
+    embedded = []
+    original = classifier._embed_files  # pylint: disable=protected-access
+
+    def spy(pdf_files):
+        embedded.extend(pdf_files)
+        return original(pdf_files)
+
+    classifier._embed_files = spy  # pylint: disable=protected-access
+    classifier.train()
+    assert not embedded
+    assert classifier.hash_path.exists()
+    assert not classifier.legacy_hash_path.exists()
+    assert len(classifier.labels) == len(training_pdfs)
+
+
+def test_index_not_matching_matrix_forces_retrain(
+    classifier: PDFSemanticClassifier, training_pdfs: tuple[Path, ...]
+) -> None:
+    """A matrix saved without its index, as after an interrupted save, is never trusted."""
+    classifier.train()
+    matrix = np.load(classifier.model_path)
+    np.save(classifier.model_path, np.vstack([matrix, matrix[:1]]))
+    assert classifier.needs_retrain()
+
+    classifier.train()
+    assert np.load(classifier.model_path).shape[0] == len(training_pdfs)
+    assert not classifier.needs_retrain()
+
+
+def test_needs_retrain_tracks_training_folders(
+    classifier: PDFSemanticClassifier, labeled_training_copy: Path
+) -> None:
+    """A fresh cache needs no retrain until a training PDF is added, removed or edited."""
+    assert classifier.needs_retrain()
+    classifier.train()
+    assert not classifier.needs_retrain()
+
+    invoice_dir = labeled_training_copy / "invoice"
+    added = invoice_dir / "added_copy.pdf"
+    shutil.copy(next(invoice_dir.glob("*.pdf")), added)
+    assert classifier.needs_retrain()
+
+    added.unlink()
+    assert not classifier.needs_retrain()
+
+
+def test_needs_retrain_notices_pdf_overwritten_in_place(
+    classifier: PDFSemanticClassifier, labeled_training_copy: Path
+) -> None:
+    """Rewriting a training PDF under the same name leaves folder mtimes alone."""
+    classifier.train()
+    invoice_dir = labeled_training_copy / "invoice"
+    folder_times = (invoice_dir.stat().st_atime_ns, invoice_dir.stat().st_mtime_ns)
+    pdf_file = next(invoice_dir.glob("*.pdf"))
+    with pdf_file.open("ab") as f:
+        f.write(b"\n%%EOF\n")
+    os.utime(invoice_dir, ns=folder_times)
+
+    assert classifier.needs_retrain()
+
+
+def test_changing_embedder_reembeds_everything(
+    classifier: PDFSemanticClassifier, training_pdfs: tuple[Path, ...]
+) -> None:
+    """Rows cached by a different embedder export are never mixed with new vectors."""
+    classifier.train()
+    classifier.embedder_id = "same-model|onnx|onnx/model_qint8_avx512_vnni.onnx"
+    assert classifier.needs_retrain()
+
+    embedded = []
+    original = classifier._embed_files  # pylint: disable=protected-access
+
+    def spy(pdf_files):
+        embedded.extend(pdf_files)
+        return original(pdf_files)
+
+    classifier._embed_files = spy  # pylint: disable=protected-access
+    classifier.train()
+    assert len(embedded) == len(training_pdfs)
+    assert not classifier.needs_retrain()
+
+
+def test_extract_text_falls_back_to_pdfminer(
+    invoice_test_pdf: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Files MuPDF refuses are retried with pdfminer before giving up."""
+
+    def refuse(*_args, **_kwargs):
+        raise RuntimeError("MuPDF cannot open this file")
+
+    monkeypatch.setattr("pdfclassify.pdf_semantic_classifier.pymupdf.open", refuse)
+    # pylint: disable=import-outside-toplevel, protected-access
+    from pdfclassify.pdf_semantic_classifier import _extract_text
+
+    assert _extract_text(invoice_test_pdf).strip()
+
+
+def test_extract_text_missing_file_is_not_a_parse_error(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """OS errors propagate as-is instead of triggering the pdfminer fallback."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from pdfminer import high_level
+
+    from pdfclassify.pdf_semantic_classifier import _extract_text
+
+    def unexpected(*_args, **_kwargs):
+        raise AssertionError("pdfminer fallback used for a missing file")
+
+    monkeypatch.setattr(high_level, "extract_text", unexpected)
+    with pytest.raises(FileNotFoundError):
+        _extract_text(tmp_path / "missing.pdf")
+
+
+@pytest.mark.usefixtures("fake_embedder")
+def test_cold_predict_trains_before_extracting_query(
+    labeled_training_copy: Path, invoice_test_pdf: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Without a saved model, training happens before the query PDF is parsed."""
+    classifier = PDFSemanticClassifier(
+        data_dir=str(labeled_training_copy), cache_name=labeled_training_copy.name
+    )
+    for path in (classifier.model_path, classifier.index_path, classifier.hash_path):
+        path.unlink(missing_ok=True)
+
+    events = []
+    # pylint: disable=import-outside-toplevel, protected-access
+    from pdfclassify import pdf_semantic_classifier
+
+    real_train, real_extract = classifier.train, pdf_semantic_classifier._extract_text
+
+    def train():
+        events.append("train")
+        real_train()
+
+    def extract(path):
+        if Path(path) == invoice_test_pdf:
+            events.append("query")
+        return real_extract(path)
+
+    classifier.train = train
+    monkeypatch.setattr(pdf_semantic_classifier, "_extract_text", extract)
+    classifier.predict(str(invoice_test_pdf))
+    assert events == ["train", "query"]
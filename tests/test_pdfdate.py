@@ -1,7 +1,5 @@
 import json
-import os
-import subprocess
-import sys
+from datetime import datetime
 from pathlib import Path
 
 import pytest
@@ -9,7 +7,7 @@ import pytest
 import pdfclassify.pdf_date as pdf_date
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_text():
     return (
         "Invoice Date: 23/05/2025\n"
@@ -54,6 +52,18 @@ def test_find_all_dates_respects_minimum_parts(sample_text, tmp_meta_file, parts
     assert matched == expected
 
 
+def test_sidecar_parsed_once_and_invalid_json_falls_back(tmp_meta_file):
+    pdf_file, meta_path = tmp_meta_file
+    write_meta(meta_path, ["month", "year"], ["Invoice Date"])
+    sidecar = pdf_date._load_sidecar(pdf_file)  # pylint: disable=protected-access
+    assert pdf_date.load_minimum_parts(pdf_file, sidecar) == ["month", "year"]
+    assert pdf_date.get_preferred_contexts(pdf_file, sidecar) == ["Invoice Date"]
+
+    meta_path.write_text("{not json", encoding="utf-8")
+    assert pdf_date.load_minimum_parts(pdf_file) == ["day", "month", "year"]
+    assert pdf_date.get_preferred_contexts(pdf_file) == []
+
+
 def test_mm_yyyy_parsing_respected(tmp_meta_file):
     """Ensure MM/YYYY like '04/2025' is parsed as April 2025 when month/year required."""
     pdf_file, meta_path = tmp_meta_file
@@ -89,6 +99,56 @@ def test_excludes_old_years(tmp_meta_file):
     assert not results
 
 
+def test_spurious_match_does_not_hide_overlapping_date():
+    """A rejected candidate ("0 date 01") must not swallow the real date it overlaps."""
+    text = "Page 0 date 01/05/2025"
+    results = pdf_date.find_all_dates(text, ["en"], ["day", "month", "year"])
+    assert [raw for _, raw in results] == ["01/05/2025"]
+
+
+def test_find_all_dates_by_page_merges_pages_in_order():
+    pages = [f"Page {i}: {i + 1:02d}/05/2025, repeated 01/05/2025" for i in range(10)]
+    results = pdf_date.find_all_dates_by_page(pages, ["en"], ["day", "month", "year"])
+    assert [raw for _, raw in results] == [f"{i + 1:02d}/05/2025" for i in range(10)]
+
+
+@pytest.mark.parametrize(
+    "raw,pattern_id,expected",
+    [
+        ("05/07/2025", 3, (2025, 7, 5)),
+        ("5-7-2025", 3, (2025, 7, 5)),
+        ("2025-07-05", 4, (2025, 7, 5)),
+        ("01/02/25", 3, None),  # two-digit year is left to dateparser
+        ("12/31/2025", 3, None),  # not a valid day-first date
+    ],
+)
+def test_parse_numeric_date_fast_path(raw, pattern_id, expected):
+    parsed = pdf_date.parse_numeric_date(raw, pattern_id)
+    if expected is None:
+        assert parsed is None
+    else:
+        assert (parsed.year, parsed.month, parsed.day) == expected
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("25 July 2025", True),
+        ("01 avril 2025", True),
+        ("17 de mayo de 2025", True),
+        ("3 März 2025", True),
+        ("12 items 2025", False),
+    ],
+)
+def test_looks_like_date_word_forms(raw, expected):
+    assert pdf_date.looks_like_date(raw) is expected
+
+
+def test_find_all_dates_limit_stops_early(sample_text):
+    results = pdf_date.find_all_dates(sample_text, ["en", "fr", "es"], ["day", "month", "year"], 2)
+    assert [raw for _, raw in results] == ["23/05/2025", "01 avril 2025"]
+
+
 def test_context_based_selection(sample_text, tmp_meta_file):
     """Context keywords must trigger extraction only when before the date."""
     pdf_file, meta_path = tmp_meta_file
@@ -103,35 +163,53 @@ def test_context_based_selection(sample_text, tmp_meta_file):
     assert raw == "23/05/2025"
 
 
+def test_context_uses_next_line_and_skips_dates_before_keyword():
+    text = "Printed 01/01/2025 Invoice no 12 date\n23/05/2025\nDue: 24/05/2025"
+    result = pdf_date.date_from_context(text, ["INVOICE"], ["en"], ["day", "month", "year"])
+    assert result is not None
+    assert result[1] == "23/05/2025"
+
+
+@pytest.mark.parametrize(
+    "template,expected",
+    [
+        (None, "20250503"),
+        ("invoice_YYYYMM", "invoice_202505"),
+        ("{DD}-MM", "{03}-05"),
+    ],
+)
+def test_format_with_template(template, expected):
+    assert pdf_date.format_with_template(datetime(2025, 5, 3), template) == expected
+
+
 # --- CLI Integration Tests with monkeypatched text extraction ---
 
 
-def run_cli(script_path: Path, args):
-    cmd = [sys.executable, str(script_path)] + args
-    env = os.environ.copy()
-    env["PDFDATE_TEST_TEXT"] = (
-        "Invoice Date: 23/05/2025\nPeriod: 05/2025\nFrench: 01 avril 2025\n"
-        "Spanish: 17 de mayo de 2025\nDuplicate: 23/05/2025\nOld: 1999-12-31"
-    )
-    return subprocess.check_output(cmd, text=True, env=env).strip()
+def run_cli(args, capsys, monkeypatch, text):
+    # Call main() in-process rather than starting a new interpreter per test
+    monkeypatch.setenv("PDFDATE_FAKE_TEXT", text)
+    pdf_date.main([str(a) for a in args])
+    return capsys.readouterr().out.strip()
 
 
-@pytest.fixture
-def pdf_date_cli(tmp_path):
-    cli_copy = tmp_path / "pdf_date.py"
-    cli_copy.write_text(Path(pdf_date.__file__).read_text(encoding="utf-8"))
-    return cli_copy
+def test_cli_nth_date(tmp_meta_file, capsys, monkeypatch):
+    pdf_file, meta_path = tmp_meta_file
+    write_meta(meta_path, ["day", "month", "year"])
+    output = run_cli(
+        [pdf_file, "-n", "2"], capsys, monkeypatch, "Issued 3 May 2024, due 1 June 2024"
+    )
+    assert output == "20240601"
 
 
-# def test_cli_list_mode(tmp_meta_file, pdf_date_cli):
+# def test_cli_list_mode(tmp_meta_file, capsys, monkeypatch, sample_text):
 #     pdf_file, meta_path = tmp_meta_file
 #     write_meta(meta_path, ["day", "month", "year"])
-#     output = run_cli(pdf_date_cli, ["--list", str(pdf_file)])
+#     output = run_cli(["--list", pdf_file], capsys, monkeypatch, sample_text)
 #     assert "23/05/2025" in output
 #
 #
-# def test_cli_template_mode(tmp_meta_file, pdf_date_cli):
+# def test_cli_template_mode(tmp_meta_file, capsys, monkeypatch, sample_text):
 #     pdf_file, meta_path = tmp_meta_file
 #     write_meta(meta_path, ["day", "month", "year"])
-#     output = run_cli(pdf_date_cli, [str(pdf_file), "-t", "invoice_YYYYMM"])
+#     output = run_cli([pdf_file, "-t", "invoice_YYYYMM"], capsys, monkeypatch, sample_text)
 #     assert output.startswith("invoice_202505")
@@ -6,20 +6,16 @@ from datetime import datetime
 from pathlib import Path
 
 import pytest
-from fpdf import FPDF
 
 from pdfclassify.pdf_metadata_manager import PDFMetadataManager
+from pdfclassify.pdf_process import PdfProcess
 
 
 @pytest.fixture
-def dummy_pdf(tmp_path: Path) -> Path:
+def dummy_pdf(tmp_path: Path, text_pdf_bytes: bytes) -> Path:
     """Create a dummy PDF with known timestamp and name."""
     pdf_path = tmp_path / "original_name.pdf"
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt="Dummy content", ln=True)
-    pdf.output(str(pdf_path))
+    pdf_path.write_bytes(text_pdf_bytes)
 
     # Set known mod time
     mod_time = datetime(2022, 1, 1, 12, 0, 0).timestamp()
@@ -53,3 +49,55 @@ def test_sidecar_original_metadata(dummy_pdf: Path, tmp_path: Path) -> None:
     assert manager.read_custom_field("original_filename") == "original_name.pdf"
     assert manager.read_custom_field("original_date") == iso_date
     assert manager.verify_pdf_hash() is True
+
+
+def test_restore_skips_utime_when_timestamp_matches(
+    dummy_pdf: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Restoring a file that still has its original mtime only renames it."""
+    process = PdfProcess(str(dummy_pdf))
+    renamed_path = dummy_pdf.with_name("renamed.pdf")
+    process.pdf_file = process._manager().rename_with_sidecar(  # pylint: disable=protected-access
+        renamed_path
+    )
+
+    calls = []
+    monkeypatch.setattr(
+        "pdfclassify.pdf_process.os.utime", lambda *args, **kwargs: calls.append(args)
+    )
+    process.restore_original_state()
+
+    assert process.pdf_file == dummy_pdf
+    assert dummy_pdf.exists()
+    assert not calls
+
+
+def test_restore_resets_touched_timestamp(dummy_pdf: Path) -> None:
+    """A file touched after classification gets its original mtime back."""
+    original = dummy_pdf.stat()
+    process = PdfProcess(str(dummy_pdf))
+    renamed_path = dummy_pdf.with_name("renamed.pdf")
+    process.pdf_file = process._manager().rename_with_sidecar(  # pylint: disable=protected-access
+        renamed_path
+    )
+    os.utime(renamed_path, None)
+
+    PdfProcess(str(renamed_path)).restore_original_state()
+
+    restored = dummy_pdf.stat()
+    assert restored.st_mtime_ns == original.st_mtime_ns
+    assert restored.st_size == original.st_size
+
+
+def test_restore_sets_microsecond_timestamp_exactly(dummy_pdf: Path) -> None:
+    """Sub-second original dates come back exactly, with no float rounding."""
+    original = datetime(2022, 1, 1, 12, 0, 0, 123456)
+    process = PdfProcess(str(dummy_pdf))
+    process._manager().write_custom_field(  # pylint: disable=protected-access
+        "original_date", original.isoformat()
+    )
+
+    process.restore_original_state()
+
+    seconds = int(original.replace(microsecond=0).timestamp())
+    assert dummy_pdf.stat().st_mtime_ns == seconds * 10**9 + 123_456_000
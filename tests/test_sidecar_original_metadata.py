@@ -2,10 +2,15 @@
 
 # pylint: disable=redefined-outer-name
 
+import errno
+import hashlib
 import json
+import os
 from pathlib import Path
 
+import numpy as np
 import pytest
+from pypdf.errors import PdfReadError
 
 from pdfclassify.pdf_metadata_manager import PDFMetadataManager
 
@@ -35,12 +40,26 @@ def test_delete_custom_metadata(valid_pdf_file: Path) -> None:
 
 def test_pdf_file_not_modified(valid_pdf_file: Path) -> None:
     """Ensure PDF file content is not modified when writing metadata."""
-    original_content = valid_pdf_file.read_bytes()
+    with valid_pdf_file.open("rb") as f:
+        original_digest = hashlib.file_digest(f, "sha256").hexdigest()
 
     manager = PDFMetadataManager(valid_pdf_file)
     manager.write_custom_field("classification", "unchanged-test")
 
-    assert valid_pdf_file.read_bytes() == original_content
+    with valid_pdf_file.open("rb") as f:
+        assert hashlib.file_digest(f, "sha256").hexdigest() == original_digest
+    assert manager.read_custom_field("sha256") == original_digest
+
+
+def test_pdf_timestamps_preserved(valid_pdf_file: Path) -> None:
+    """Writing sidecar metadata leaves the PDF's timestamps untouched."""
+    past = valid_pdf_file.stat().st_mtime_ns - 100 * 10**9
+    os.utime(valid_pdf_file, ns=(past, past))
+
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_field("classification", "invoice")
+
+    assert valid_pdf_file.stat().st_mtime_ns == past
 
 
 def test_print_metadata_smoke(valid_pdf_file: Path, capsys: pytest.CaptureFixture) -> None:
@@ -75,3 +94,207 @@ def test_sidecar_file_content(valid_pdf_file: Path) -> None:
         data = json.load(f)
 
     assert data.get("classification") == "invoice"
+    assert not sidecar_path.with_suffix(".tmp").exists(), "Temp file should be renamed away"
+
+
+def test_write_custom_fields_batch(valid_pdf_file: Path) -> None:
+    """Ensure write_custom_fields writes all fields and honours overwrite=False per field."""
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_field("classification", "initial")
+
+    assert manager.write_custom_fields(
+        {"classification": "new", "Confidence": 0.9}, overwrite=False
+    )
+    assert manager.read_custom_field("classification") == "initial"
+    assert manager.read_custom_field("confidence") == 0.9
+    assert manager.write_custom_fields({"classification": "new"}, overwrite=False) is False
+
+
+def test_failed_save_leaves_cached_metadata_unchanged(
+    valid_pdf_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A write that never reaches disk is not reported by later reads."""
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_field("classification", "invoice")
+
+    def disk_full(*_args) -> None:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr("pdfclassify.pdf_metadata_manager.os.replace", disk_full)
+    with pytest.raises(OSError):
+        manager.write_custom_field("classification", "receipt")
+    with pytest.raises(OSError):
+        manager.delete_custom_field("classification")
+
+    assert manager.read_custom_field("classification") == "invoice"
+
+
+def test_unchanged_value_skips_save(valid_pdf_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Writing the value a field already holds leaves the sidecar alone."""
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_fields({"classification": "invoice", "confidence": 0.9})
+
+    def fail(*_args) -> None:
+        raise AssertionError("sidecar rewritten for an unchanged value")
+
+    monkeypatch.setattr("pdfclassify.pdf_metadata_manager.os.replace", fail)
+    assert manager.write_custom_fields({"classification": "invoice", "confidence": 0.9})
+
+
+def test_unchanged_value_refreshes_digest_of_modified_pdf(valid_pdf_file: Path) -> None:
+    """An unchanged value is still saved when the PDF's digest no longer matches."""
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_field("classification", "invoice")
+    with valid_pdf_file.open("ab") as f:
+        f.write(b"\n%%EOF\n")
+
+    assert manager.write_custom_field("classification", "invoice")
+    assert manager.verify_pdf_hash()
+
+
+def test_batch_saves_sidecar_once(valid_pdf_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Field writes and deletes inside batch() are held in memory and saved on exit."""
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_field("classification", "initial")
+    saves = []
+    replace = os.replace
+
+    def spy(src, dst) -> None:
+        saves.append(dst)
+        replace(src, dst)
+
+    monkeypatch.setattr("pdfclassify.pdf_metadata_manager.os.replace", spy)
+    with manager.batch():
+        manager.write_custom_field("classification", "invoice")
+        manager.write_custom_field("confidence", 0.9)
+        manager.delete_custom_field("classification")
+        assert manager.read_custom_field("confidence") == 0.9
+        assert PDFMetadataManager(valid_pdf_file).read_custom_field("classification") == "initial"
+
+    assert len(saves) == 1
+    reloaded = PDFMetadataManager(valid_pdf_file)
+    assert reloaded.read_custom_field("classification") is None
+    assert reloaded.read_custom_field("confidence") == 0.9
+    assert reloaded.verify_pdf_hash()
+
+
+def test_batch_discarded_when_block_raises(valid_pdf_file: Path) -> None:
+    """A batch interrupted by an exception saves none of its changes."""
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_field("classification", "initial")
+
+    with pytest.raises(RuntimeError):
+        with manager.batch():
+            manager.write_custom_field("classification", "invoice")
+            raise RuntimeError("interrupted")
+
+    assert manager.read_custom_field("classification") == "initial"
+    assert PDFMetadataManager(valid_pdf_file).read_custom_field("classification") == "initial"
+
+
+def test_sidecar_reloaded_after_external_change(valid_pdf_file: Path) -> None:
+    """Ensure the cached sidecar is re-read when the file changes on disk."""
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_field("classification", "invoice")
+    assert manager.read_custom_field("classification") == "invoice"
+
+    sidecar_path = valid_pdf_file.with_suffix(valid_pdf_file.suffix + ".meta.json")
+    mtime_ns = sidecar_path.stat().st_mtime_ns
+    sidecar_path.write_text(json.dumps({"classification": "receipt"}), encoding="utf-8")
+    os.utime(sidecar_path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+    assert manager.read_custom_field("classification") == "receipt"
+
+
+def test_signature_check_and_strict_mode(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A header/trailer-only file passes the signature check but not strict validation."""
+    stub = tmp_path / "stub.pdf"
+    stub.write_bytes(b"%PDF-1.4\n%%EOF")
+    PDFMetadataManager(stub)
+
+    monkeypatch.setenv("PDFCLASSIFY_STRICT_PDF", "1")
+    stub.write_bytes(b"%PDF-1.7\n\n%%EOF")  # new size, so not served from the validation cache
+    with pytest.raises(PdfReadError):
+        PDFMetadataManager(stub)
+
+
+def test_validation_pass_records_sha256(tmp_path: Path) -> None:
+    """The digest computed while validating matches a plain SHA-256 of the file."""
+    pdf = tmp_path / "hashed.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n" + b"x" * 5000 + b"\n%%EOF")
+    manager = PDFMetadataManager(pdf)
+    manager.write_custom_field("classification", "invoice")
+
+    assert manager.read_custom_field("sha256") == hashlib.sha256(pdf.read_bytes()).hexdigest()
+    assert manager.verify_pdf_hash()
+
+
+def test_validation_caches_are_bounded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The per-process validation and digest caches drop their least recently used entries."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from collections import OrderedDict
+
+    from pdfclassify import pdf_metadata_manager
+
+    monkeypatch.setattr(pdf_metadata_manager, "_CACHE_SIZE", 2)
+    monkeypatch.setattr(PDFMetadataManager, "_validated", OrderedDict())
+    monkeypatch.setattr(PDFMetadataManager, "_hashes", OrderedDict())
+    pdfs = [tmp_path / f"{n}.pdf" for n in range(3)]
+    for n, pdf in enumerate(pdfs):
+        pdf.write_bytes(b"%PDF-1.4\n" + bytes([n]) + b"\n%%EOF")
+    PDFMetadataManager(pdfs[0])
+    PDFMetadataManager(pdfs[1])
+    PDFMetadataManager(pdfs[0])  # a cache hit makes the first file the most recent again
+    PDFMetadataManager(pdfs[2])
+
+    cached = {key[0] for key in PDFMetadataManager._validated}
+    assert cached == {os.path.abspath(pdfs[0]), os.path.abspath(pdfs[2])}
+    assert len(PDFMetadataManager._hashes) == 2
+
+
+def test_numpy_scalars_stored_as_json_numbers(valid_pdf_file: Path) -> None:
+    """Ensure numpy scalars are written as plain JSON numbers."""
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_fields({"confidence": np.float32(0.5), "count": np.int64(3)})
+
+    data = json.loads(manager.sidecar_path.read_text(encoding="utf-8"))
+    assert data["confidence"] == 0.5 and isinstance(data["confidence"], float)
+    assert data["count"] == 3 and isinstance(data["count"], int)
+
+
+def test_rename_within_folder_skips_mkdir(
+    valid_pdf_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Renaming beside the original needs no directory creation."""
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_field("classification", "invoice")
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("mkdir called for a same-folder rename")
+
+    monkeypatch.setattr(Path, "mkdir", fail)
+    target = valid_pdf_file.with_name("invoice.pdf")
+    assert manager.rename_with_sidecar(target) == target
+    assert target.with_name("invoice.pdf.meta.json").exists()
+
+
+def test_rename_with_sidecar_across_filesystems(
+    valid_pdf_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A cross-device rename (EXDEV) falls back to copying the PDF and its sidecar."""
+    manager = PDFMetadataManager(valid_pdf_file)
+    manager.write_custom_field("classification", "invoice")
+    real_rename = os.rename
+    calls = []
+
+    def cross_device_rename(src, dst):
+        calls.append(src)
+        if len(calls) <= 2:
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        real_rename(src, dst)
+
+    monkeypatch.setattr(os, "rename", cross_device_rename)
+    target = tmp_path / "moved" / "invoice.pdf"
+    assert manager.rename_with_sidecar(target) == target
+    assert target.exists() and not valid_pdf_file.exists()
+    assert manager.read_custom_field("classification") == "invoice"